@@ -0,0 +1,324 @@
+"""
+Plays thousands of games of Go Fish in lockstep with NumPy arrays.
+
+Every game is a row in a set of arrays: the rank counts of every player's hand,
+the deck and its cursor, the books and the strategy memory. A step plays one turn
+of every unfinished game at once. Suits don't matter to the rules, so the cards
+are only tracked by rank.
+
+The DumbPlayer, StingyPlayer and TryingPlayer strategies are played the same way
+their classes in players play them.
+
+This module needs NumPy, which the rest of fish_lib does not.
+"""
+import numpy as np
+
+from . import players
+from .cards import RANKS
+from .rules import STANDARD
+
+DUMB, STINGY, TRYING = 0, 1, 2
+STRATEGIES = {players.DumbPlayer: DUMB,
+              players.StingyPlayer: STINGY,
+              players.TryingPlayer: TRYING}
+
+
+def pick(rng, weights):
+    """
+    Picks a column for every row of weights, with a chance that matches its weight.
+
+    Parameters:
+        rng:
+            A numpy.random.Generator.
+        weights:
+            A 2D array of ints that are 0 or more.
+
+    :return: An array of column indices. Rows whose weights are all 0 get -1.
+    """
+    total = weights.sum(axis=1)
+    roll = (rng.random(len(total)) * total).astype(np.int64)
+    choice = (weights.cumsum(axis=1) <= roll[:, None]).sum(axis=1)
+    choice[total == 0] = -1
+    return choice
+
+
+class BatchGoFish(object):
+    """
+    Runs game_count games of Go Fish with the same number of players.
+
+    Properties:
+        counts: (game, player, rank) array of how many cards of a rank each player holds.
+        sizes: (game, player) array of how many cards each player holds.
+        deck: (game, card) array of the ranks of every deck, top card first.
+        cursor: (game,) array of where the top of every deck is.
+        books: (game, player) array of how many books each player has.
+        playing: (game, player) array of which players are still playing.
+        active: (game,) array of the active player of every game.
+        turns: (game,) array of how many turns every game took.
+        done: (game,) array of which games are over.
+        types: (game, player) array of the strategy of every seat. See STRATEGIES.
+    """
+
+    def __init__(self, game_count, player_count=6, player_types=(players.DumbPlayer,
+                                                                 players.StingyPlayer,
+                                                                 players.TryingPlayer),
+                 seat_types=None, deny_limit=None, seed=None, rules=None):
+        """
+        Parameters:
+            game_count:
+                The number of games to play at once.
+            player_count:
+                The number of players in every game. Has to be allowed by the rules.
+            player_types:
+                The player classes to pick seats from, like in
+                factory.GoFishFactory.build_basic_game. Ignored if seat_types is given.
+            seat_types:
+                A (game_count, player_count) array of player classes or strategy codes
+                for a fixed seating.
+            deny_limit:
+                The number of times a StingyPlayer denies each face. If None, the
+                deny_limit of the rules is used.
+            seed:
+                The seed of the numpy.random.Generator.
+            rules:
+                The rules.Rules of every game. If None, uses rules.STANDARD.
+        """
+        self.rules = rules if rules is not None else STANDARD
+        hand_size = self.rules.hand_size(player_count)
+
+        self.rng = np.random.default_rng(seed)
+        self.game_count = game_count
+        self.player_count = player_count
+        self.deny_limit = deny_limit if deny_limit is not None else self.rules.deny_limit
+        self.deck_size = len(self.rules.deck)
+
+        if seat_types is None:
+            self.types = self._pick_seats(player_types)
+        else:
+            self.types = np.vectorize(lambda t: STRATEGIES.get(t, t), otypes=[np.int8])(
+                np.asarray(seat_types, dtype=object))
+
+        # Shuffles every deck at once by sorting random keys.
+        shuffled = self.rng.random((game_count, self.deck_size)).argsort(axis=1)
+        self.deck = (shuffled // self.rules.copies).astype(np.int8)
+
+        games = np.arange(game_count)
+        self.counts = np.zeros((game_count, player_count, len(RANKS)), dtype=np.int8)
+        for seat in range(player_count):
+            for card in range(seat * hand_size, (seat + 1) * hand_size):
+                self.counts[games, seat, self.deck[:, card]] += 1
+        self.cursor = np.full(game_count, player_count * hand_size, dtype=np.int64)
+
+        self.books = np.zeros((game_count, player_count), dtype=np.int64)
+        self.playing = np.ones((game_count, player_count), dtype=bool)
+        self.active = np.zeros(game_count, dtype=np.int64)
+        self.turns = np.zeros(game_count, dtype=np.int64)
+        self.done = np.zeros(game_count, dtype=bool)
+
+        self.sizes = np.full((game_count, player_count), hand_size, dtype=np.int64)
+        self.denied = np.zeros((game_count, player_count, len(RANKS)), dtype=np.int64)
+        # The player last seen asking for a rank, or -1.
+        self.seen = np.full((game_count, player_count, len(RANKS)), -1, dtype=np.int64)
+        self._fresh = np.ones(game_count * player_count, dtype=bool)
+        # Row i is every seat in turn order after seat i, ending with i.
+        self._ahead = (np.arange(player_count)[:, None]
+                       + np.arange(1, player_count + 1)) % player_count
+
+        # Flat views, indexed by seat (game * player_count + player) and by
+        # cell (seat * len(RANKS) + rank). They are much cheaper to index.
+        self._hands = self.counts.reshape(-1, len(RANKS))
+        self._cells = self.counts.reshape(-1)
+        self._sizes = self.sizes.reshape(-1)
+        self._books = self.books.reshape(-1)
+        self._playing = self.playing.reshape(-1)
+        self._types = self.types.reshape(-1)
+        self._denied_cells = self.denied.reshape(-1)
+        self._seen_hands = self.seen.reshape(-1, len(RANKS))
+        self._seen_cells = self.seen.reshape(-1)
+
+    def _pick_seats(self, player_types):
+        """
+        Picks the strategy of every seat the same way GoFishFactory.build_basic_game does.
+        :return: A (game_count, player_count) array of strategy codes.
+        """
+        codes = np.array([STRATEGIES[cls] for cls in player_types], dtype=np.int8)
+        limits = np.array([min(cls.LIMIT, self.player_count) for cls in player_types])
+        if limits.sum() < self.player_count:
+            raise ValueError('Player types has too many limited types!')
+
+        type_count = np.zeros((self.game_count, len(player_types)), dtype=np.int64)
+        types = np.empty((self.game_count, self.player_count), dtype=np.int8)
+        games = np.arange(self.game_count)
+        for seat in range(self.player_count):
+            chosen = pick(self.rng, (type_count < limits).astype(np.int64))
+            type_count[games, chosen] += 1
+            types[:, seat] = codes[chosen]
+        return types
+
+    def _draw(self, games, seats):
+        """
+        Draws the top card of each game's deck in to the hand of a seat.
+        Every game in games has to have cards left in its deck.
+
+        Parameters:
+            games:
+                The indices of the games.
+            seats:
+                The flat seat indices (game * player_count + player) that draw.
+
+        :return: The ranks that were drawn.
+        """
+        ranks = self.deck[games, self.cursor[games]]
+        self._cells[seats * len(RANKS) + ranks] += 1
+        self._sizes[seats] += 1
+        self.cursor[games] += 1
+        return ranks
+
+    def step(self):
+        """
+        Plays one turn of every unfinished game.
+        :return: True if any game was still going.
+        """
+        live = g = np.flatnonzero(~self.done)
+        if not g.size:
+            return False
+
+        rng = self.rng
+        cells = self._cells
+        sizes = self._sizes
+        playing = self._playing
+        r_count = len(RANKS)
+        p_count = self.player_count
+        a = self.active[g]
+        s = g * p_count + a
+        self.turns[g] += 1
+
+        # Players with empty hands have to draw, and drop out if they can't.
+        empty = sizes[s] == 0
+        if empty.any():
+            e_games, e_seats = g[empty], s[empty]
+            can_draw = self.cursor[e_games] < self.deck_size
+            self._draw(e_games[can_draw], e_seats[can_draw])
+            playing[e_seats[~can_draw]] = False
+
+        keep = playing[s]
+        self.active[g[~keep]] = (a[~keep] + 1) % p_count
+        g, a, s = g[keep], a[keep], s[keep]
+        rows = np.arange(len(g))
+
+        # Asking.
+        valid = self.playing[g]
+        hand = self._hands[s]
+        others = valid.copy()
+        others[rows, a] = False
+        asked = others.any(axis=1)
+        face = pick(rng, hand)
+        target = pick(rng, others.astype(np.int64))
+
+        trying = np.flatnonzero(self._types[s] == TRYING)
+        if trying.size:
+            holder = self._seen_hands[s[trying]]
+            known = holder >= 0
+            holder_valid = valid[trying[:, None], np.where(known, holder, 0)]
+            candidates = known & holder_valid & (hand[trying] > 0)
+            chosen = pick(rng, candidates.astype(np.int64))
+            informed = chosen >= 0
+            t_rows = trying[informed]
+            face[t_rows] = chosen[informed]
+            target[t_rows] = holder[informed, chosen[informed]]
+            self._seen_cells[s[t_rows] * r_count + chosen[informed]] = -1
+
+        target[~asked] = a[~asked]
+        t = g * p_count + target
+        a_cells = s * r_count + face
+        t_cells = t * r_count + face
+
+        # Confirming.
+        given = cells[t_cells].astype(np.int64)
+        given[~asked] = 0
+        stingy = ((self._types[t] == STINGY) & (given > 0)
+                  & (self._denied_cells[t_cells] < self.deny_limit))
+        self._denied_cells[t_cells[stingy]] += 1
+        given[stingy] = 0
+
+        # Overhearing.
+        listeners = valid & (self.types[g] == TRYING)
+        listeners[rows, a] = False
+        listeners[rows, target] = False
+        l_rows, l_seats = np.nonzero(listeners & asked[:, None])
+        self._seen_cells[((g[l_rows] * p_count + l_seats) * r_count
+                          + face[l_rows])] = a[l_rows]
+
+        # Handing over or going fish. Only the rank that was gained can make a new book.
+        won = given > 0
+        cells[a_cells[won]] += given[won].astype(np.int8)
+        cells[t_cells[won]] = 0
+        sizes[s[won]] += given[won]
+        sizes[t[won]] -= given[won]
+
+        gained = face.copy()
+        fish = np.flatnonzero(~won)
+        fish = fish[self.cursor[g[fish]] < self.deck_size]
+        gained[fish] = self._draw(g[fish], s[fish])
+
+        # The next player is the next one that was playing at the start of the turn.
+        ahead = self._ahead[a]
+        self.active[g] = ahead[rows, valid[rows[:, None], ahead].argmax(axis=1)]
+
+        # Books. With more than one deck, a rank can make more than one book at once.
+        book_size = self.rules.book_size
+        book_cells = s * r_count + gained
+        made = cells[book_cells] // book_size
+        full = made > 0
+        cells[book_cells[full]] -= (made[full] * book_size).astype(np.int8)
+        sizes[s[full]] -= made[full] * book_size
+        self._books[s[full]] += made[full]
+
+        # Every player checks their whole hand on their first turn, for the books they
+        # were dealt.
+        first = np.flatnonzero(self._fresh[s])
+        if first.size:
+            f_seats = s[first]
+            self._fresh[f_seats] = False
+            f_hands = self._hands[f_seats]
+            f_made = f_hands // book_size
+            self._hands[f_seats] = f_hands - f_made * book_size
+            f_books = f_made.sum(axis=1)
+            sizes[f_seats] -= f_books * book_size
+            self._books[f_seats] += f_books
+
+        out = self.cursor[g] >= self.deck_size
+        playing[t[out]] = sizes[t[out]] > 0
+        playing[s[out]] = sizes[s[out]] > 0
+
+        # Only games with an empty deck can be over.
+        ending = live[self.cursor[live] >= self.deck_size]
+        self.done[ending] = ~self.playing[ending].any(axis=1)
+        if self.rules.leftover:
+            self.done[ending] |= self.books[ending].sum(axis=1) == self.rules.max_books
+        self.done[live[self.turns[live] >= self.rules.turn_limit]] = True
+        return True
+
+    def run(self):
+        """
+        Steps every game until all of them are done.
+        :return: self
+        """
+        while self.step():
+            pass
+        return self
+
+    @property
+    def winners(self):
+        """
+        :return: A (game, player) array that is True for every player with the most books.
+        """
+        return self.books == self.books.max(axis=1, keepdims=True)
+
+    def win_counts(self):
+        """
+        Counts the wins of every strategy, ties included, like main.stat_run.
+        :return: A dict of player class: number of wins.
+        """
+        wins = np.bincount(self.types[self.winners], minlength=len(STRATEGIES))
+        return {cls: int(wins[code]) for cls, code in STRATEGIES.items() if wins[code]}
@@ -0,0 +1,48 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from .batch import BatchGoFish, STINGY, TRYING
+from . import players
+from .rules import Rules
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class BatchGoFishTestCase(unittest.TestCase):
+    def setUp(self):
+        self.batch = BatchGoFish(2000, player_count=6, seed=3).run()
+
+    def test_every_game_ends(self):
+        self.assertTrue(self.batch.done.all())
+        self.assertTrue((self.batch.books.sum(axis=1) == 13).all())
+        self.assertTrue((self.batch.counts == 0).all())
+
+    def test_seat_limits(self):
+        self.assertTrue(((self.batch.types == STINGY).sum(axis=1) <= 1).all())
+
+    def test_win_rates(self):
+        # These are the win rates of run_tournament over 30000 games.
+        win_count = self.batch.win_counts()
+        self.assertAlmostEqual(win_count[players.StingyPlayer] / 2000, 0.61, delta=0.05)
+        self.assertAlmostEqual(win_count[players.TryingPlayer] / 2000, 0.71, delta=0.05)
+        self.assertAlmostEqual(win_count[players.DumbPlayer] / 2000, 0.10, delta=0.03)
+
+    def test_fixed_seats(self):
+        seats = [[players.TryingPlayer, players.DumbPlayer]] * 50
+        batch = BatchGoFish(50, player_count=2, seat_types=seats, seed=1).run()
+        self.assertTrue((batch.types[:, 0] == TRYING).all())
+        self.assertTrue(batch.done.all())
+
+    def test_rules(self):
+        for rules in (Rules(decks=2), Rules(book_size=3)):
+            batch = BatchGoFish(200, player_count=5, seed=2, rules=rules).run()
+            self.assertTrue(batch.done.all())
+            self.assertTrue((batch.books.sum(axis=1) == rules.max_books).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
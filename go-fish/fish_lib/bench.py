@@ -0,0 +1,228 @@
+"""
+Throughput benchmarks for fish_lib.
+
+Every case is a player count and a seating. A case is timed in two passes: one that
+plays whole games as fast as it can for games and turns per second, and a smaller
+one that times every turn on its own for the latency percentiles. Results are added
+to a JSON history file and compared against the baseline stored in it, so a drop in
+throughput fails the run.
+
+Run it from the go-fish folder:
+
+    python -m fish_lib.bench --history bench.json --threshold 10
+
+Nothing here needs a network or anything outside of the standard library.
+"""
+import argparse
+from collections import namedtuple
+import json
+import os
+import platform
+import sys
+import time
+
+from .factory import GamePool
+from .players import DumbPlayer, StingyPlayer, TryingPlayer
+
+# seats is a tuple of player classes for a fixed seating, or None for seats picked at
+# random like GoFishFactory.build_basic_game picks them.
+BenchCase = namedtuple('BenchCase', ['name', 'player_count', 'seats'])
+
+CASES = (BenchCase('2p-trying-dumb', 2, (TryingPlayer, DumbPlayer)),
+         BenchCase('4p-stingy-trying', 4, (StingyPlayer, TryingPlayer, TryingPlayer,
+                                           TryingPlayer)),
+         BenchCase('6p-mixed', 6, None),
+         BenchCase('10p-dumb', 10, (DumbPlayer,) * 10))
+
+# The metrics that are checked for regressions. Higher is better for all of them.
+THROUGHPUT = ('games_per_sec', 'turns_per_sec')
+
+
+def percentile(ordered, fraction):
+    """
+    :param ordered: A sorted list of numbers.
+    :param fraction: The fraction from 0 to 1 of the numbers that are at or below the result.
+    :return: The nearest-rank percentile of ordered.
+    """
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_case(case, game_count=500, latency_games=100, seed=0, repeat=3):
+    """
+    Times one case.
+
+    Parameters:
+        case:
+            A BenchCase.
+        game_count:
+            The number of games to play in every throughput pass.
+        latency_games:
+            The number of games whose turns are timed one at a time.
+        seed:
+            The first game seed. The games use the seeds after it.
+        repeat:
+            The number of throughput passes. The fastest one is kept.
+
+    :return: A dict of games_per_sec, turns_per_sec, and the p50_ns, p90_ns and p99_ns
+             turn latencies.
+    """
+    pool = GamePool(case.player_count, seat_types=case.seats)
+
+    best = None
+    for _ in range(repeat):
+        turns = 0
+        start = time.perf_counter()
+        for game_seed in range(seed, seed + game_count):
+            turns += pool.play(game_seed).turns
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = elapsed, turns
+
+    # Plays the turns one by one like do_full_round does, but times each of them.
+    latencies = []
+    clock = time.perf_counter_ns
+    for game_seed in range(seed, seed + latency_games):
+        b_game = pool.deal(game_seed)
+        turn_limit = b_game.rules.turn_limit
+        while not b_game.done and b_game.turns < turn_limit:
+            start = clock()
+            b_game.do_turn()
+            latencies.append(clock() - start)
+            b_game.turns += 1
+    latencies.sort()
+
+    elapsed, turns = best
+    return {'games_per_sec': game_count / elapsed,
+            'turns_per_sec': turns / elapsed,
+            'p50_ns': percentile(latencies, 0.5),
+            'p90_ns': percentile(latencies, 0.9),
+            'p99_ns': percentile(latencies, 0.99)}
+
+
+def run_bench(cases=CASES, game_count=500, latency_games=100, seed=0, repeat=3):
+    """
+    Times every case. See bench_case for the parameters.
+    :return: A dict of case name: dict of metrics.
+    """
+    return {case.name: bench_case(case, game_count, latency_games, seed, repeat)
+            for case in cases}
+
+
+def load_history(path):
+    """
+    :param path: The path of a history file. It doesn't have to exist.
+    :return: The list of runs in the history file.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path) as stream:
+        return json.load(stream)
+
+
+def save_run(path, results, baseline=False):
+    """
+    Adds a run to the end of a history file.
+
+    Parameters:
+        path:
+            The path of the history file.
+        results:
+            The results from run_bench.
+        baseline:
+            If True, the run is marked as the baseline that later runs are compared to.
+
+    :return: The run that was added.
+    """
+    history = load_history(path)
+    run = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+           'python': platform.python_version(),
+           'machine': platform.machine(),
+           'baseline': baseline,
+           'results': results}
+    history.append(run)
+    with open(path, 'w') as stream:
+        json.dump(history, stream, indent=2)
+    return run
+
+
+def find_baseline(history):
+    """
+    :param history: A list of runs from load_history.
+    :return: The latest run marked as the baseline, or the first run if none are.
+             None if the history is empty.
+    """
+    for run in reversed(history):
+        if run.get('baseline'):
+            return run
+    return history[0] if history else None
+
+
+def compare(results, baseline, threshold=10.0):
+    """
+    Finds every throughput metric that dropped too far below the baseline.
+
+    Parameters:
+        results:
+            The results from run_bench.
+        baseline:
+            The results of the baseline run.
+        threshold:
+            The most that a metric can drop, as a percentage of the baseline.
+
+    :return: A list of (case name, metric, baseline value, new value, percent drop).
+             Cases that aren't in both are skipped.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        for metric in THROUGHPUT:
+            old, new = baseline[name][metric], metrics[metric]
+            drop = (old - new) / old * 100 if old else 0.0
+            if drop > threshold:
+                regressions.append((name, metric, old, new, drop))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks from the command line.
+    :return: The exit code: 1 if a throughput metric regressed, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks fish_lib games.')
+    parser.add_argument('--history', default='bench_history.json',
+                        help='The JSON file that runs are added to.')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='The most percent that throughput can drop below the baseline.')
+    parser.add_argument('--games', type=int, default=500,
+                        help='The number of games in every throughput pass.')
+    parser.add_argument('--latency-games', type=int, default=100,
+                        help='The number of games whose turns are timed one at a time.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='The number of throughput passes. The fastest is kept.')
+    parser.add_argument('--baseline', action='store_true',
+                        help='Marks this run as the new baseline.')
+    args = parser.parse_args(argv)
+
+    baseline = find_baseline(load_history(args.history))
+    results = run_bench(game_count=args.games, latency_games=args.latency_games,
+                        repeat=args.repeat)
+    save_run(args.history, results, baseline=args.baseline)
+
+    print('{:<18} {:>12} {:>12} {:>9} {:>9} {:>9}'.format('case', 'games/s', 'turns/s',
+                                                          'p50 ns', 'p90 ns', 'p99 ns'))
+    for name, metrics in results.items():
+        print('{:<18} {games_per_sec:>12.1f} {turns_per_sec:>12.1f} {p50_ns:>9} {p90_ns:>9} '
+              '{p99_ns:>9}'.format(name, **metrics))
+
+    if args.baseline or baseline is None:
+        return 0
+    regressions = compare(results, baseline['results'], args.threshold)
+    for name, metric, old, new, drop in regressions:
+        print('REGRESSION {} {}: {:.1f} -> {:.1f} ({:.1f}% slower)'.format(name, metric, old,
+                                                                        new, drop))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+from .bench import BenchCase, compare, find_baseline, load_history, main, run_bench, save_run
+from .players import DumbPlayer
+
+from contextlib import redirect_stdout
+from io import StringIO
+import os
+import tempfile
+import unittest
+
+TINY = (BenchCase('2p-dumb', 2, (DumbPlayer, DumbPlayer)),)
+
+
+class BenchTestCase(unittest.TestCase):
+    def test_run_bench(self):
+        results = run_bench(TINY, game_count=10, latency_games=5, repeat=1)
+        metrics = results['2p-dumb']
+        self.assertGreater(metrics['games_per_sec'], 0)
+        self.assertGreater(metrics['turns_per_sec'], metrics['games_per_sec'])
+        self.assertLessEqual(metrics['p50_ns'], metrics['p90_ns'])
+        self.assertLessEqual(metrics['p90_ns'], metrics['p99_ns'])
+
+    def test_compare(self):
+        baseline = {'a': {'games_per_sec': 100.0, 'turns_per_sec': 1000.0}}
+        results = {'a': {'games_per_sec': 95.0, 'turns_per_sec': 800.0},
+                   'b': {'games_per_sec': 1.0, 'turns_per_sec': 1.0}}
+        regressions = compare(results, baseline, threshold=10)
+        self.assertEqual(regressions, [('a', 'turns_per_sec', 1000.0, 800.0, 20.0)])
+
+    def test_history(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'history.json')
+            self.assertIsNone(find_baseline(load_history(path)))
+            first = save_run(path, {'a': 1})
+            save_run(path, {'a': 2})
+            self.assertEqual(find_baseline(load_history(path)), first)
+            marked = save_run(path, {'a': 3}, baseline=True)
+            save_run(path, {'a': 4})
+            self.assertEqual(find_baseline(load_history(path)), marked)
+
+    def test_main_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'history.json')
+            args = ['--history', path, '--games', '5', '--latency-games', '2', '--repeat', '1']
+            with redirect_stdout(StringIO()):
+                self.assertEqual(main(args + ['--baseline']), 0)
+
+            # Make the baseline impossibly fast.
+            history = load_history(path)
+            for metrics in history[0]['results'].values():
+                metrics['games_per_sec'] *= 1000
+            save_run(path, history[0]['results'], baseline=True)
+            with redirect_stdout(StringIO()) as out:
+                self.assertEqual(main(args), 1)
+            self.assertIn('REGRESSION', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+The cards used in a game of Go Fish.
+
+Cards are normally (RANK, SUIT) tuples of strings. The compact encoding stores
+a card as a small int instead: rank index * 4 + suit index. The rank and suit
+are found with arithmetic, and a whole deck fits in a byte array. The tuples
+are only needed when a card is shown to a person.
+"""
+from array import array
+import itertools
+import random
+
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace')
+SUITS = ('Spades', 'Clubs', 'Hearts', 'Diamond')
+
+BASE_DECK = tuple(itertools.product(RANKS, SUITS))
+COMPACT_DECK = array('B', range(len(BASE_DECK)))
+
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
+
+def encode(card):
+    """
+    Turns a card tuple into its compact int.
+    :param card: The card tuple in format (RANK, SUIT).
+    :return: An int from 0 to 51.
+    """
+    return RANK_INDEX[card[0]] << 2 | SUIT_INDEX[card[1]]
+
+
+def decode(card):
+    """
+    Turns a compact int back in to a card tuple. Card tuples are returned as is.
+    :param card: An int from 0 to 51 or a card tuple.
+    :return: The card tuple in format (RANK, SUIT).
+    """
+    if isinstance(card, int):
+        return RANKS[card >> 2], SUITS[card & 3]
+    return card
+
+
+def face_name(face):
+    """
+    Gets the printable name of a face value.
+    :param face: A rank index from a compact card or a rank string.
+    :return: The rank as a string.
+    """
+    if isinstance(face, int):
+        return RANKS[face]
+    return face
+
+
+class Deck(object):
+    """
+    A deck of cards that is drawn from the top.
+
+    The cards are kept in one list or array and a cursor marks the top of the deck,
+    so drawing and dealing never shift the cards that are left.
+    """
+
+    def __init__(self, cards, rng=None):
+        """
+        Parameters:
+            cards:
+                A list or array of the cards, top card first.
+            rng:
+                The random.Random used to shuffle. If None, uses the random module.
+        """
+        self._cards = cards
+        self._top = 0
+        self.rng = rng if rng is not None else random
+
+    def __len__(self):
+        return len(self._cards) - self._top
+
+    def __iter__(self):
+        return iter(self._cards[self._top:])
+
+    def __repr__(self):
+        return 'Deck({!r})'.format(list(self))
+
+    def deal(self, count):
+        """
+        Takes a number of cards off of the top of the deck.
+        :param count: The number of cards to take.
+        :return: A list or array of the cards. Shorter than count if the deck ran out.
+        """
+        top = self._top
+        self._top = min(top + count, len(self._cards))
+        return self._cards[top:self._top]
+
+    def draw(self):
+        """
+        Takes the top card off of the deck.
+        Raises IndexError if the deck is empty.
+        :return: The card that was on top.
+        """
+        card = self._cards[self._top]
+        self._top += 1
+        return card
+
+    def shuffle(self):
+        """
+        Scrambles the cards left in the deck with a Fisher-Yates shuffle.
+
+        The shuffle happens in a copy of the cards, so a snapshot never changes.
+        """
+        cards = self._cards[:]
+        top = self._top
+        randint = self.rng.randint
+        for i in range(len(cards) - 1, top, -1):
+            j = randint(top, i)
+            cards[i], cards[j] = cards[j], cards[i]
+        self._cards = cards
+
+    def snapshot(self):
+        """
+        Saves the order of the deck and where its top is. This is O(1) because the
+        cards are never changed in place after they are shuffled.
+        :return: A tuple that can be given to restore.
+        """
+        return self._cards, self._top
+
+    def restore(self, snapshot):
+        """
+        Puts the deck back to how it was when snapshot was taken.
+        :param snapshot: The result of snapshot.
+        """
+        self._cards, self._top = snapshot
@@ -0,0 +1,255 @@
+"""
+An exact solver for the end of a game of Go Fish between DumbPlayers.
+
+Once the deck is empty, nothing is hidden from chance but the players' picks: a
+DumbPlayer asks for the face of a random card in its hand from a random player that
+is still playing. So the rest of the game is a Markov chain over the hands, and the
+chance of every way it can end can be worked out instead of played out.
+
+A state is the hands of the playing players, in turn order starting with the player
+whose turn it is, with every hand counted by face. Faces are all alike to the
+players, so a state is kept as a sorted tuple of face columns, one count for every
+player, and states that only differ by which face is which share one answer. The
+answers are kept in a functools.lru_cache, so many games that reach the same
+endings only work them out once.
+
+A successful ask always takes every card of a face from a player, so the number of
+(player, face) pairs that hold cards goes down and the state never comes back. A
+failed ask only passes the turn on, so the players of one state ask around in a
+ring until one of them succeeds. The ring is solved in closed form: with B_i the
+results of player i's asks that leave the state and q_i the chance that player i's
+ask fails and passes the turn on,
+
+    V_0 = (B_0 + q_0 B_1 + q_0 q_1 B_2 + ...) / (1 - q_0 q_1 ... q_(k-1))
+"""
+import functools
+
+from .players import DumbPlayer
+
+# The most cards left in the hands for EndgameSolver.can_solve, unless it is given its own.
+MAX_CARDS = 12
+
+
+def plays_dumb(player):
+    """
+    :return: True if player asks and confirms exactly like a DumbPlayer.
+    """
+    cls = type(player)
+    return (isinstance(player, DumbPlayer)
+            and cls.ask_for_card is DumbPlayer.ask_for_card
+            and cls.confirm_ask is DumbPlayer.confirm_ask)
+
+
+def canonical(hands):
+    """
+    Puts a state in the form that the solver caches it by.
+    :param hands: A sequence of hands in turn order, each a sequence of counts by face.
+                  Every hand has to have the same faces in the same order.
+    :return: A tuple of (player count, sorted tuple of face columns). Faces that no one
+             holds are left out.
+    """
+    return len(hands), tuple(sorted(column for column in zip(*hands) if any(column)))
+
+
+class EndgameSolver(object):
+    """
+    Works out how the rest of a game between DumbPlayers ends once the deck is empty.
+
+    Properties:
+        book_size: The number of cards of one face that make a book.
+        max_cards: The most cards left in the hands for can_solve to say yes.
+    """
+
+    def __init__(self, book_size=4, max_cards=MAX_CARDS, maxsize=1 << 16):
+        """
+        See the properties for the parameters. maxsize is the most states that are
+        kept in the cache. If None, the cache can grow without a bound.
+        """
+        self.book_size = book_size
+        self.max_cards = max_cards
+        self._solve = functools.lru_cache(maxsize)(self._solve_state)
+
+    def cache_info(self):
+        """
+        :return: The functools.lru_cache statistics of the state cache.
+        """
+        return self._solve.cache_info()
+
+    def cache_clear(self):
+        """
+        Forgets every state that was worked out.
+        """
+        self._solve.cache_clear()
+
+    def book_distribution(self, hands):
+        """
+        Works out the books that the players will still make.
+
+        :param hands: A sequence of hands in turn order, starting with the player whose
+                      turn it is, each a sequence of counts by face. Every player in it
+                      is playing, and no hand may hold a full book.
+        :return: A dict of (books made by every player, in the order of hands): chance.
+        """
+        return self._solve(canonical(hands))
+
+    def _solve_state(self, key):
+        player_count, columns = key
+        none = (0,) * player_count
+        if player_count < 2 or not columns:
+            # A player alone at the table only lays down the books it has, and it
+            # has none.
+            return {none: 1.0}
+
+        hands = [[column[i] for column in columns] for i in range(player_count)]
+        seats = list(range(player_count))
+        result = {}
+        stay = 1.0
+        for i in seats:
+            leave, fail = self._turn(hands, seats[i:] + seats[:i])
+            for books, chance in leave.items():
+                result[books] = result.get(books, 0.0) + stay * chance
+            stay *= fail
+            if not stay:
+                # The turn never gets past this player.
+                return result
+        if stay >= 1.0:
+            # Nobody can ever get a card, so the game runs to the turn limit.
+            return {none: 1.0}
+        scale = 1.0 / (1.0 - stay)
+        return {books: chance * scale for books, chance in result.items()}
+
+    def _turn(self, hands, order):
+        """
+        Plays out every ask that the first player of order can make.
+        :return: A tuple of (dict of the books made in the outcomes that leave the state:
+                 chance, the chance that the turn just passes on).
+        """
+        asker = order[0]
+        hand = hands[asker]
+        size = sum(hand)
+        leave = {}
+        if not size:
+            # Can't draw from an empty deck, so the player drops out.
+            self._follow(leave, 1.0, hands, order[1:], asker, 0)
+            return leave, 0.0
+
+        book_size = self.book_size
+        targets = order[1:]
+        fail = 0.0
+        for face, count in enumerate(hand):
+            if not count:
+                continue
+            chance = count / size / len(targets)
+            for target in targets:
+                given = hands[target][face]
+                if given:
+                    after = [list(h) for h in hands]
+                    total = count + given
+                    made = total // book_size
+                    after[asker][face] = total - made * book_size
+                    after[target][face] = 0
+                    following = [seat for seat in order[1:] + [asker]
+                                 if seat not in (asker, target) or any(after[seat])]
+                    self._follow(leave, chance, after, following, asker, made)
+                elif not any(hands[target]):
+                    following = [seat for seat in order[1:] + [asker] if seat != target]
+                    self._follow(leave, chance, hands, following, asker, 0)
+                else:
+                    fail += chance
+        return leave, fail
+
+    def _follow(self, leave, chance, hands, following, asker, made):
+        """
+        Adds the outcomes of the state that an ask leads to in to leave.
+        """
+        books = [0] * len(hands)
+        for outcome, inner in self._solve(canonical([hands[seat] for seat in following])).items():
+            for seat, count in zip(following, outcome):
+                books[seat] = count
+            books[asker] += made
+            key = tuple(books)
+            leave[key] = leave.get(key, 0.0) + chance * inner
+            books[:] = [0] * len(hands)
+
+    def can_solve(self, b_game):
+        """
+        :param b_game: A game.BasicGoFish.
+        :return: True if the deck is empty, every playing player plays like a DumbPlayer,
+                 the rules are ones this solver can work out and no more than max_cards
+                 cards are in the hands.
+        """
+        rules = b_game.rules
+        if b_game.deck or rules.book_size != self.book_size or rules.leftover:
+            return False
+        cards = 0
+        for player in b_game.players:
+            if player.playing:
+                if not plays_dumb(player):
+                    return False
+                cards += len(player.hand)
+        return cards <= self.max_cards
+
+    def final_books(self, b_game):
+        """
+        Works out how many books every player will end a game with. Cards held by players
+        that stopped playing are left where they are.
+        :param b_game: A game.BasicGoFish that can_solve says yes to.
+        :return: A dict of (book count of every seat): chance.
+        """
+        order = b_game.turn_order()
+        faces = sorted({face for seat in order for face in b_game.players[seat].hand.faces()})
+        book_size = self.book_size
+        start = [len(player.books) for player in b_game.players]
+        hands = []
+        for seat in order:
+            hand = b_game.players[seat].hand
+            counts = []
+            for face in faces:
+                count = hand.count(face)
+                # A full book that hasn't been laid down yet goes down on the next check.
+                start[seat] += count // book_size
+                counts.append(count % book_size)
+            hands.append(counts)
+
+        result = {}
+        for outcome, chance in self.book_distribution(hands).items():
+            books = list(start)
+            for seat, count in zip(order, outcome):
+                books[seat] += count
+            key = tuple(books)
+            result[key] = result.get(key, 0.0) + chance
+        return result
+
+    def winners(self, b_game):
+        """
+        Works out who will win a game.
+        :param b_game: A game.BasicGoFish that can_solve says yes to.
+        :return: A dict of (tuple of the winning seats): chance.
+        """
+        result = {}
+        for books, chance in self.final_books(b_game).items():
+            best = max(books)
+            key = tuple(seat for seat, count in enumerate(books) if count == best)
+            result[key] = result.get(key, 0.0) + chance
+        return result
+
+
+def play_out(b_game, solver):
+    """
+    Plays a game like do_full_round, without an observer, until the solver can work out
+    the rest of it.
+
+    :param b_game: A game.BasicGoFish.
+    :param solver: An EndgameSolver.
+    :return: A dict of (tuple of the winning seats): chance. A game that was played to the
+             end, or to the turn limit, has one outcome with a chance of 1.
+    """
+    turn_limit = b_game.rules.turn_limit
+    while not b_game.done and b_game.turns < turn_limit:
+        if solver.can_solve(b_game):
+            return solver.winners(b_game)
+        b_game.do_turn()
+        b_game.turns += 1
+
+    seats = {player: seat for seat, player in enumerate(b_game.players)}
+    return {tuple(seats[player] for player in b_game.winner or ()): 1.0}
@@ -0,0 +1,72 @@
+from collections import Counter
+from random import Random
+import unittest
+
+from . import game, players
+from .endgame import EndgameSolver, canonical, play_out
+
+
+class EndgameSolverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.solver = EndgameSolver(max_cards=12)
+
+    def deal_endgame(self, seed, player_count=3):
+        rng = Random(seed)
+        self.players = [players.DumbPlayer(None, name=str(i + 1), rng=rng)
+                        for i in range(player_count)]
+        self.rng = rng
+        b_game = game.BasicGoFish(self.players, rng=rng)
+        while not b_game.done and not self.solver.can_solve(b_game):
+            b_game.do_turn()
+            b_game.turns += 1
+        return b_game
+
+    def test_canonical(self):
+        self.assertEqual(canonical([[1, 0, 2], [0, 3, 1]]), canonical([[2, 1, 0], [1, 0, 3]]))
+        self.assertEqual(canonical([[0, 1], [0, 2]]), (2, ((1, 2),)))
+
+    def test_one_ask_left(self):
+        self.assertEqual(self.solver.book_distribution([[3], [1]]), {(1, 0): 1.0})
+        self.assertEqual(self.solver.book_distribution([[1], [3]]), {(1, 0): 1.0})
+
+    def test_ring(self):
+        # Every player holds half of one face, so who books first is all that matters.
+        result = self.solver.book_distribution([[2, 0, 0], [0, 2, 0], [2, 2, 0]])
+        self.assertAlmostEqual(sum(result.values()), 1.0)
+        for books in result:
+            self.assertEqual(sum(books), 2)
+
+    def test_matches_games(self):
+        b_game = self.deal_endgame(1)
+        self.assertTrue(self.solver.can_solve(b_game))
+        exact = self.solver.winners(b_game)
+        self.assertAlmostEqual(sum(exact.values()), 1.0)
+
+        state = b_game.snapshot()
+        wins = Counter()
+        game_count = 4000
+        for i in range(game_count):
+            b_game.restore(state)
+            self.rng.seed(i)
+            b_game.do_full_round()
+            wins[tuple(self.players.index(player) for player in b_game.winner)] += 1
+        for winners, chance in exact.items():
+            self.assertAlmostEqual(wins[winners] / game_count, chance, delta=0.03)
+
+    def test_only_dumb_players(self):
+        b_game = self.deal_endgame(2)
+        self.assertTrue(self.solver.can_solve(b_game))
+        self.players[b_game.turn_order()[0]].__class__ = players.TryingPlayer
+        self.assertFalse(self.solver.can_solve(b_game))
+
+    def test_play_out(self):
+        rng = Random(5)
+        for _ in range(20):
+            b_players = [players.DumbPlayer(None, name=str(i + 1), rng=rng) for i in range(4)]
+            result = play_out(game.BasicGoFish(b_players, rng=rng), self.solver)
+            self.assertAlmostEqual(sum(result.values()), 1.0)
+        self.assertGreater(self.solver.cache_info().hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,8 @@
-from io import StringIO
-from random import choice
-import sys
+from random import Random
 
 from . import players
 from . import game
+from .rules import STANDARD
 
 
 class GoFishFactory:
@@ -14,49 +13,168 @@ class GoFishFactory:
     @staticmethod
     def build_basic_game(player_count=2, player_types=(players.DumbPlayer,
                                                        players.StingyPlayer,
-                                                       players.TryingPlayer)):
+                                                       players.TryingPlayer),
+                         observer=None, compact=False, rng=None, profiler=None, rules=None,
+                         seat_types=None):
         """
         Builds a normal game of GoFish with all of the safe checking.
 
         Keyword Parameters:
             player_count: int
                 The number of players to create to start the game.
-                Bounds: 2 <= player_count <= 10
+                Bounds: rules.min_players <= player_count <= rules.max_players
             player_types: Player
                 The classes of players that we can create.
+            observer: observers.GameObserver
+                Gets told about every event of the game. If None, the game is silent.
+            compact: bool
+                If True, the game uses compact int cards. See cards.encode.
+            rng: random.Random or int
+                The source of randomness for the game and every player. If it is a seed
+                or None, a new random.Random is made from it. The same seed always plays
+                out the same game.
+            profiler: profiling.TurnProfiler
+                Times every phase of every turn. If None, nothing is timed.
+            rules: rules.Rules
+                The rules of the game. If None, uses rules.STANDARD.
+            seat_types: list
+                The class of every seat, in turn order, for a fixed seating. If given,
+                player_count and player_types are ignored.
 
         :return: An instance of game.BasicGoFish
         """
-        if player_count > 10 or player_count < 2:
-            raise ValueError('Player count is out of range! 2 <= player_count <= 10.')
+        if rules is None:
+            rules = STANDARD
+        if seat_types is not None:
+            player_count = len(seat_types)
+        rules.check_player_count(player_count)
 
+        if not isinstance(rng, Random):
+            rng = Random(rng)
+
+        if seat_types is not None:
+            for cls in set(seat_types):
+                if seat_types.count(cls) > cls.LIMIT:
+                    raise ValueError('Seat types has too many of {}!'.format(cls.__name__))
+        else:
+            seat_types = GoFishFactory.pick_seats(player_count, player_types, rng)
+
+        b_players = [player_type(None, name=str(i + 1), rng=rng)
+                     for i, player_type in enumerate(seat_types)]
+        return game.BasicGoFish(b_players, observer=observer, compact=compact, rng=rng,
+                                profiler=profiler, rules=rules)
+
+    @staticmethod
+    def pick_seats(player_count, player_types, rng):
+        """
+        Picks the class of every seat at random, keeping to every class's LIMIT.
+        Raises ValueError if the limits don't leave enough seats.
+
+        Parameters:
+            player_count:
+                The number of seats.
+            player_types:
+                The classes of players that we can pick.
+            rng:
+                The random.Random to pick with.
+
+        :return: A list of player classes, one for every seat.
+        """
         if sum(x.LIMIT for x in player_types) < player_count:
             raise ValueError('Player types has too many limited types!')
 
-        b_players = []
+        seat_types = []
         player_type_count = {}
         for i in range(player_count):
-            player_type = choice([cls for cls in player_types
-                                  if player_type_count.get(cls, 0) < cls.LIMIT])
+            player_type = rng.choice([cls for cls in player_types
+                                      if player_type_count.get(cls, 0) < cls.LIMIT])
             player_type_count[player_type] = player_type_count.get(player_type, 0) + 1
-            b_players.append(player_type(None, name=str(i + 1)))
-        return game.BasicGoFish(b_players)
+            seat_types.append(player_type)
+        return seat_types
 
     @staticmethod
     def run_silent_game(**kwargs):
         """
-        Suppresses all of the print statements made by game.BasicGoFish during a call of
-        do_full_round.
+        Builds a game without an observer and plays it with do_full_round. Nothing is
+        formatted or printed during the game.
 
         Made for testing purposes because I'm getting annoyed at scrolling.
         :return: An instance of game.BasicGoFish
         """
+        kwargs['observer'] = None
         b_game = GoFishFactory.build_basic_game(**kwargs)
+        b_game.do_full_round()
+        return b_game
 
-        real_out = sys.stdout
-        sys.stdout = StringIO()
 
-        b_game.do_full_round()
+class GamePool:
+    """
+    Plays games like GoFishFactory.build_basic_game, but keeps one game and a player
+    of every class for every seat and reuses them from game to game. A seed gives the
+    same game it would give build_basic_game, without building any new objects.
+    """
+
+    def __init__(self, player_count=2, player_types=(players.DumbPlayer,
+                                                     players.StingyPlayer,
+                                                     players.TryingPlayer),
+                 compact=False, rules=None, seat_types=None):
+        """
+        See GoFishFactory.build_basic_game for the parameters.
+        """
+        if rules is None:
+            rules = STANDARD
+        if seat_types is not None:
+            player_count = len(seat_types)
+        rules.check_player_count(player_count)
 
-        sys.stdout = real_out
+        self.player_count = player_count
+        self.player_types = player_types
+        self.seat_types = seat_types
+        self.rng = Random()
+        self._players = {}  # Data is stored as (class, seat): the player for that seat.
+        self.game = game.BasicGoFish(self._seat(self._pick_seats()), compact=compact,
+                                     rng=self.rng, rules=rules)
+
+    def _pick_seats(self):
+        """
+        :return: The fixed seat_types, or seats picked like build_basic_game picks them.
+        """
+        if self.seat_types is not None:
+            return self.seat_types
+        return GoFishFactory.pick_seats(self.player_count, self.player_types, self.rng)
+
+    def _seat(self, seat_types):
+        """
+        :return: The pooled players for seat_types, building the ones that are missing.
+        """
+        b_players = []
+        for i, player_type in enumerate(seat_types):
+            player = self._players.get((player_type, i))
+            if player is None:
+                player = self._players[player_type, i] = player_type(None, name=str(i + 1),
+                                                                     rng=self.rng)
+            b_players.append(player)
+        return b_players
+
+    def deal(self, seed):
+        """
+        Sets up a new game from its seed without playing it.
+
+        The game that is returned is the pool's only game, so it is only good until the
+        next call of deal or play.
+
+        :param seed: The seed of the game, like the rng of build_basic_game.
+        :return: The game.BasicGoFish, ready for its first turn.
+        """
+        self.rng.seed(seed)
+        self.game.reset(self._seat(self._pick_seats()))
+        return self.game
+
+    def play(self, seed):
+        """
+        Plays one silent game from its seed. See deal.
+        :return: The finished game.BasicGoFish.
+        """
+        b_game = self.deal(seed)
+        b_game.do_full_round()
         return b_game
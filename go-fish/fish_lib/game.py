@@ -4,15 +4,19 @@ This sets the framework for a game of GoFish.
 Author: Justin Smith
 Date: 1/23/18
 """
-import itertools
-from random import choice, randint
+from collections import namedtuple
+import random
 
 from . import players
+from .cards import BASE_DECK, RANKS, SUITS, Deck, decode
+from .hand import CompactHand, Hand
+from .rules import STANDARD
 
-RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace')
-SUITS = ('Spades', 'Clubs', 'Hearts', 'Diamond')
 
-BASE_DECK = tuple(itertools.product(RANKS, SUITS))
+# An immutable copy of everything that changes during a game of BasicGoFish.
+# Every field but active and turns is a tuple with one entry for every player.
+GameState = namedtuple('GameState', ['hands', 'deck', 'books', 'playing', 'active', 'turns',
+                                     'memory'])
 
 
 class BaseGame(object):
@@ -40,38 +44,157 @@ class BasicGoFish(BaseGame):
     This is the class that runs the game of Go Fish.
     """
 
-    def __init__(self, players: list):
-        self.deck = list(BASE_DECK)
+    def __init__(self, players: list, observer=None, compact=False, rng=None, profiler=None,
+                 rules=None):
+        """
+        Parameters:
+            players:
+                The players of the game, in turn order.
+            observer:
+                A observers.GameObserver that is told about every event of the game.
+                If None, the game is silent and skips the calls entirely.
+            compact:
+                If True, the cards are ints from cards.COMPACT_DECK instead of tuples
+                and the face values are rank indices.
+            rng:
+                The random.Random that shuffles the deck. If None, uses the random module.
+            profiler:
+                A profiling.TurnProfiler that times every phase of do_turn.
+                If None, nothing is timed.
+            rules:
+                The rules.Rules of the game. If None, uses rules.STANDARD.
+                Raises ValueError if the rules don't allow this many players.
+        """
+        self.observer = observer
+        self.profiler = profiler
+        self.rng = rng if rng is not None else random
+        self.rules = rules if rules is not None else STANDARD
+        self.compact = compact
+        # The deck is shuffled in to a copy, so the rules' decks can be shared.
+        if compact:
+            self._cards = self.rules.compact_deck
+            self._hand_type = CompactHand
+        else:
+            self._cards = self.rules.deck
+            self._hand_type = Hand
+        self.deck = Deck(self._cards, self.rng)
+        self.reset(players)
+
+    def reset(self, players=None):
+        """
+        Starts a new game with the same deck and hand objects, so one game object can
+        play many games in a row. The deck is shuffled again and the cards are dealt.
+        :param players: The players of the new game. If None, the same players play
+                        again. Every player's books, playing flag and memory are reset.
+        """
+        if players is not None:
+            self.players = players
+            self._seats = {player: i for i, player in enumerate(players)}
+        self.deck.restore((self._cards, 0))
         self.shuffle_deck()
 
         self.active_player_idx = 0
-        self.players = players
+        self.turns = 0
+        self._phase_start = 0  # When the profiler started timing the ask or confirm.
 
-        card_count = 5 if len(players) > 4 else 7
+        hand_type = self._hand_type
+        card_count = self.rules.hand_size(len(self.players))
         for player in self.players:
-            player.hand = self.deck[:card_count]
-            self.deck = self.deck[card_count:]
+            if type(player.hand) is hand_type:
+                player.hand.restore(self.deck.deal(card_count))
+            else:
+                player.hand = hand_type(self.deck.deal(card_count))
+            player.books.clear()
+            player.playing = True
+            player.reset_memory()
+            player.game = self
+
+        self._books_left = self.rules.max_books
+        self._link_players()
+
+        if self.observer is not None:
+            self.observer.on_start(self)
+
+    def _link_players(self):
+        """
+        Rebuilds the ring of playing players from every player's playing flag.
+
+        The ring is kept in _next and _prev, which hold the seat of the next and the
+        previous playing player of every seat. _valid caches the list of playing
+        players until someone stops playing.
+        """
+        seats = [i for i, player in enumerate(self.players) if player.playing]
+        count = len(self.players)
+        self._next = [(i + 1) % count for i in range(count)]
+        self._prev = [(i - 1) % count for i in range(count)]
+        for pos, seat in enumerate(seats):
+            self._next[seat] = seats[(pos + 1) % len(seats)]
+            self._prev[seat] = seats[pos - 1]
+        self._playing_count = len(seats)
+        self._valid = None
+
+    def _set_playing(self, player, playing):
+        """
+        Marks if a player is still playing and keeps the ring of playing players up to date.
+
+        Taking a player out of the ring is O(1). The player keeps pointing to the
+        next player, so a turn that lands on them still moves on in order.
+        """
+        if player.playing == playing:
+            return
+        player.playing = playing
+        if playing:
+            self._link_players()
+            return
+
+        seat = self._seats[player]
+        next_seat, prev_seat = self._next[seat], self._prev[seat]
+        self._next[prev_seat] = next_seat
+        self._prev[next_seat] = prev_seat
+        self._playing_count -= 1
+        self._valid = None
+
+    def turn_order(self):
+        """
+        Lists the players that are still playing, in the order of their coming turns.
+        :return: A list of seat indices, starting with the seat whose turn is next.
+        """
+        seat = self.active_player_idx
+        if not self.players[seat].playing:
+            seat = self._next[seat]
+        order = []
+        for _ in range(self._playing_count):
+            order.append(seat)
+            seat = self._next[seat]
+        return order
 
     @staticmethod
     def card_to_string(card):
         """
-        Prints a card tuple in a human-readable string.
-        :param card: The card tuple in format (RANK, SUIT).
+        Prints a card in a human-readable string.
+        :param card: The card tuple in format (RANK, SUIT) or a compact card.
         :return: A string in how a person would say it.
         """
-        return '{} of {}'.format(card[0], card[1])
+        return '{} of {}'.format(*decode(card))
 
-    @staticmethod
-    def check_player_for_book(player):
+    def check_player_for_book(self, player):
         """
         Checks if a certain player has a book. If one is found,
         then it is removed from the player's hand and added to their book list.
+
+        Only the faces that had cards added since the last check can make a book,
+        so those are the only ones looked at. With more than one deck, a face can
+        make more than one book.
         """
-        for book in filter(lambda f: player.count_copies(f) == 4, RANKS):
-            for card in itertools.product((book,), SUITS):
-                player.hand.remove(card)
-            player.books.append(book)
-            print('Player {} made a book of {}\'s.'.format(player.name, book))
+        hand = player.hand
+        book_size = self.rules.book_size
+        for book in hand.pop_changed():
+            for _ in range(hand.count(book) // book_size):
+                hand.take(book, book_size)
+                player.books.append(book)
+                self._books_left -= 1
+                if self.observer is not None:
+                    self.observer.on_book(player, book)
 
     def check_all_players_for_books(self):
         """
@@ -84,81 +207,173 @@ class BasicGoFish(BaseGame):
     def do_turn(self):
         """
         Does the active player's turn and then rotates the index to the next player.
+
+        The turn is played in three phases, begin_turn, announce_ask and end_turn, with
+        the ask and the confirm in between. The phases time the ask and the confirm for
+        the profiler, so something that can't call the players right away, like an
+        asyncio host, can run the phases itself and only make the calls.
         """
+        valid_players = self.begin_turn()
+        if valid_players is None:
+            return
         active_player = self.players[self.active_player_idx]
 
+        # We pass the players in case the Player is keeping tracking of that.
+        # requested face and requested player.
+        r_face, r_player = active_player.ask_for_card(valid_players)
+        self.announce_ask(r_face, r_player)
+        won_cards = r_player.confirm_ask(r_face)
+        self.end_turn(r_face, r_player, won_cards)
+
+    def begin_turn(self):
+        """
+        Starts the active player's turn. A player with an empty hand draws or drops out,
+        and a player with no one left to ask only lays down books.
+
+        If the turn ends here, the index is rotated to the next player. If not, the
+        profiler starts timing the ask.
+
+        :return: The list of players that can be asked, the active player included, or
+                 None if the turn is already over.
+        """
+        active_idx = self.active_player_idx
+        active_player = self.players[active_idx]
+
         if not active_player.hand:
-            active_player.playing = self.draw_card(active_player)
+            self._set_playing(active_player, self.draw_card(active_player))
 
         if not active_player.playing:
-            self.active_player_idx = (self.active_player_idx + 1) % len(self.players)
-            return
+            self.active_player_idx = self._next[active_idx]
+            return None
 
-        valid_players = list(filter(lambda p: p.playing, self.players))
+        valid_players = self._valid
+        if valid_players is None:
+            valid_players = self._valid = [p for p in self.players if p.playing]
 
-        # We pass the players in case the Player is keeping tracking of that.
-        # requested face and requested player.
-        r_face, r_player = active_player.ask_for_card(valid_players)
+        if len(valid_players) == 1:
+            # Nobody is left to ask, so all that can be done is to lay down books.
+            self.check_player_for_book(active_player)
+            if not self.deck:
+                self._set_playing(active_player, False)
+            self.active_player_idx = self._next[active_idx]
+            return None
 
-        print('Player {} asked for a {} from Player {}.'.format(active_player.name, r_face,
-                                                                r_player.name))
-        won_cards = r_player.confirm_ask(r_face)
+        if self.profiler is not None:
+            self._phase_start = self.profiler.clock()
+        return valid_players
+
+    def announce_ask(self, r_face, r_player):
+        """
+        Tells the observer about the active player's ask, before it is confirmed. The
+        profiler charges the time since begin_turn to the ask and starts timing the
+        confirm.
+        """
+        active_player = self.players[self.active_player_idx]
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.record('ask', active_player, profiler.clock() - self._phase_start)
+
+        if self.observer is not None:
+            self.observer.on_ask(active_player, r_face, r_player)
+
+        if profiler is not None:
+            self._phase_start = profiler.clock()
+
+    def end_turn(self, r_face, r_player, won_cards):
+        """
+        Finishes the active player's turn after the ask was confirmed: the profiler charges
+        the time since announce_ask to the confirm, the other players overhear it, the
+        cards are handed over or the player goes fish, books are laid down and the index
+        is rotated to the next player.
+
+        Parameters:
+            r_face:
+                The face value that was asked for.
+            r_player:
+                The player that was asked.
+            won_cards:
+                The cards r_player handed over. Empty if they had none or denied it.
+        """
+        active_player = self.players[self.active_player_idx]
+        # The next player is whoever was playing after the active player at the start
+        # of the turn. They may stop playing by the end of it, but then their turn
+        # just passes to the next one.
+        next_idx = self._next[self.active_player_idx]
+
+        profiler = self.profiler
+        if profiler is not None:
+            clock = profiler.clock
+            start = clock()
+            profiler.record('confirm', r_player, start - self._phase_start)
 
         # Gotta inform the players who just asked for one.
-        for player in valid_players:
+        for player in self._valid:
             if player != active_player and player != r_player:
                 player.hear_ask(active_player, r_face, r_player)
-                player.hear_confirm(active_player, bool(won_cards), r_face, r_player)
+                player.hear_confirm(active_player, r_face, r_player, bool(won_cards))
+                if profiler is not None:
+                    now = clock()
+                    profiler.record('broadcast', player, now - start)
+                    start = now
 
+        observer = self.observer
         if won_cards:
-            print('Player {} gained {} {}(s) with {} in hand.'.format(active_player.name,
-                                                                      len(won_cards),
-                                                                      r_face,
-                                                                      active_player.count_copies(r_face)))
+            if observer is not None:
+                observer.on_give(active_player, r_face, r_player, won_cards)
             active_player.hand.extend(won_cards)
         else:  # If won cards is empty, then we 'go fish.'
-            print('Player {} didn\'t have a {}.'.format(r_player.name, r_face))
+            if observer is not None:
+                observer.on_go_fish(active_player, r_face, r_player)
+            if profiler is not None:
+                start = clock()
             self.draw_card(active_player)
+            if profiler is not None:
+                profiler.record('draw', active_player, clock() - start)
 
-        # Increment active player index to the next valid player according to the list.
-        # This list isn't always going to be right since we have to check books
-        # right after but it's closer than the alternative.
-        val_idx = valid_players.index(active_player) + 1
-        if val_idx == len(valid_players):
-            val_idx = 0
-        self.active_player_idx = self.players.index(valid_players[val_idx])
-
+        self.active_player_idx = next_idx
 
         # Check for books
+        if profiler is not None:
+            start = clock()
         self.check_player_for_book(active_player)
+        if profiler is not None:
+            profiler.record('book', active_player, clock() - start)
 
         # To speed up the game, let's just mark if they can continue playing here.
         if not self.deck:
-            r_player.playing = bool(r_player.hand)
-            active_player.playing = bool(active_player.hand)
+            self._set_playing(r_player, bool(r_player.hand))
+            self._set_playing(active_player, bool(active_player.hand))
 
     def do_full_round(self):
         """
         This method calls do_turn until done is True.
 
-        This simulates an actual game of Go Fish. There is a iteration limit of 100000 in case of
-        logic failure.
+        This simulates an actual game of Go Fish. There is a iteration limit of the rules'
+        turn_limit in case of logic failure. The number of turns played is kept in turns.
 
         :return: the winning player obj
         """
-        iterations = 0
-        while not self.done and iterations < 100000:
-            print('\nTurn {}\n{}'.format(iterations + 1,
-                                         '-' * 15))
+        turn_limit = self.rules.turn_limit
+        while not self.done and self.turns < turn_limit:
+            if self.observer is not None:
+                self.observer.on_turn(self.turns + 1)
             self.do_turn()
-            iterations += 1
+            self.turns += 1
+
+        if self.observer is not None:
+            self.observer.on_end(self)
 
     @property
     def done(self):
         """
-        Returns true if none of the players are playing and if deck list is empty.
+        Returns true if none of the players are playing and if the deck is empty.
+
+        If the rules leave cards that can't make a book, the game is also done once
+        the deck is empty and every book has been made.
         """
-        return not ([player for player in self.players if player.playing] or self.deck)
+        if self.deck:
+            return False
+        return not self._playing_count or (self.rules.leftover and not self._books_left)
 
     def draw_card(self, player, draw_amount=1):
         """
@@ -170,19 +385,54 @@ class BasicGoFish(BaseGame):
         if len(self.deck) >= draw_amount:
             i = 0
             while i < draw_amount:
-                player.hand.append(self.deck.pop(0))
-                print('Player {} drew a {}.'.format(player.name,
-                                                    player.hand[-1][0]))
+                card = self.deck.draw()
+                player.hand.append(card)
+                if self.observer is not None:
+                    self.observer.on_draw(player, card)
                 i += 1
             return True
         return False
 
+    def snapshot(self):
+        """
+        Saves the state of the game, so it can be put back with restore.
+
+        Nothing is deep copied: the hands and books are copied in to tuples, the deck is
+        saved by reference and every player saves its own memory.
+
+        :return: A GameState.
+        """
+        players = self.players
+        return GameState(tuple(tuple(player.hand) for player in players),
+                         self.deck.snapshot(),
+                         tuple(tuple(player.books) for player in players),
+                         tuple(player.playing for player in players),
+                         self.active_player_idx,
+                         self.turns,
+                         tuple(player.snapshot_memory() for player in players))
+
+    def restore(self, state):
+        """
+        Puts the game back to how it was when state was saved. The same player, hand
+        and deck objects are reused.
+        :param state: A GameState from snapshot.
+        """
+        for i, player in enumerate(self.players):
+            player.hand.restore(state.hands[i])
+            player.books = list(state.books[i])
+            player.playing = state.playing[i]
+            player.restore_memory(state.memory[i])
+        self.deck.restore(state.deck)
+        self.active_player_idx = state.active
+        self.turns = state.turns
+        self._books_left = self.rules.max_books - sum(len(books) for books in state.books)
+        self._link_players()
+
     def shuffle_deck(self):
         """
-        Quickly scrambles the order of the deck list.
+        Quickly scrambles the order of the deck.
         """
-        for i in range(len(self.deck)):
-            self.deck.insert(i, self.deck.pop(randint(0, len(self.deck) - 1)))
+        self.deck.shuffle()
 
     @property
     def winner(self):
@@ -0,0 +1,190 @@
+from .cards import Deck, decode, encode
+from .factory import GoFishFactory
+from .game import BASE_DECK, RANKS
+from .hand import Hand
+from .players import DumbPlayer, StingyPlayer, TryingPlayer
+from .profiling import PHASES, TurnProfiler
+from .rules import STANDARD, Rules
+
+import contextlib
+import io
+import unittest
+
+
+class HandTestCase(unittest.TestCase):
+    def setUp(self):
+        self.hand = Hand([('2', 'Spades'), ('King', 'Clubs'), ('2', 'Hearts')])
+
+    def test_count(self):
+        self.assertEqual(self.hand.count('2'), 2)
+        self.assertEqual(self.hand.count('King'), 1)
+        self.assertEqual(self.hand.count('Ace'), 0)
+
+    def test_take(self):
+        self.assertEqual(self.hand.take('2'), [('2', 'Spades'), ('2', 'Hearts')])
+        self.assertEqual(list(self.hand), [('King', 'Clubs')])
+        self.assertEqual(self.hand.take('2'), [])
+
+    def test_take_count(self):
+        self.assertEqual(self.hand.take('2', 1), [('2', 'Hearts')])
+        self.assertEqual(self.hand.count('2'), 1)
+        self.assertEqual(len(self.hand), 2)
+
+    def test_list_api(self):
+        self.hand.append(('Ace', 'Diamond'))
+        self.hand.remove(('King', 'Clubs'))
+        self.assertEqual(len(self.hand), 3)
+        self.assertEqual(self.hand[-1], ('Ace', 'Diamond'))
+        self.assertIn(('2', 'Hearts'), self.hand)
+        self.assertRaises(ValueError, self.hand.remove, ('King', 'Clubs'))
+
+    def test_changed(self):
+        self.assertEqual(list(self.hand.pop_changed()), ['2', 'King'])
+        self.assertEqual(list(self.hand.pop_changed()), [])
+
+
+class DeckTestCase(unittest.TestCase):
+    def test_draw_and_deal(self):
+        deck = Deck(list(range(10)))
+        self.assertEqual(deck.draw(), 0)
+        self.assertEqual(deck.deal(3), [1, 2, 3])
+        self.assertEqual(len(deck), 6)
+        self.assertEqual(deck.deal(10), [4, 5, 6, 7, 8, 9])
+        self.assertFalse(deck)
+        self.assertRaises(IndexError, deck.draw)
+
+    def test_shuffle_keeps_cards(self):
+        deck = Deck(list(BASE_DECK))
+        deck.shuffle()
+        self.assertEqual(sorted(deck), sorted(BASE_DECK))
+
+
+class TryingPlayerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.b_game = GoFishFactory.build_basic_game(
+            seat_types=(TryingPlayer, DumbPlayer, DumbPlayer), rng=2)
+        self.player, self.other, self.third = self.b_game.players
+
+    def test_asks_last_holder(self):
+        face = next(iter(self.player.hand.faces()))
+        self.player.hear_ask(self.third, face, self.other)
+        self.assertEqual(self.player.ask_for_card(self.b_game.players), (face, self.third))
+        # The holder is forgotten once it has been asked.
+        self.assertFalse(self.player.known)
+
+    def test_skips_players_out_of_the_game(self):
+        face = next(iter(self.player.hand.faces()))
+        self.player.hear_ask(self.third, face, self.other)
+        self.third.playing = False
+        self.assertEqual(self.player.ask_for_card(self.b_game.players[:2])[1], self.other)
+
+    def test_memory(self):
+        face = next(iter(self.player.hand.faces()))
+        memory = self.player.snapshot_memory()
+        self.player.hear_ask(self.other, face, self.third)
+        self.player.restore_memory(memory)
+        self.assertFalse(self.player.known)
+        self.assertEqual(self.player.holders, [None] * len(RANKS))
+
+
+class BasicGoFishTestCase(unittest.TestCase):
+    def test_full_game(self):
+        for player_count in range(2, 11):
+            b_game = GoFishFactory.run_silent_game(player_count=player_count)
+            self.assertTrue(b_game.done)
+            self.assertEqual(sum(len(p.books) for p in b_game.players), len(RANKS))
+            self.assertFalse(any(p.hand for p in b_game.players))
+            self.assertTrue(b_game.winner)
+
+    def test_full_compact_game(self):
+        b_game = GoFishFactory.run_silent_game(player_count=5, compact=True)
+        books = sorted(book for p in b_game.players for book in p.books)
+        self.assertEqual(books, list(range(len(RANKS))))
+
+    def test_silent_game(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for player_count in (2, 6):
+                GoFishFactory.run_silent_game(player_count=player_count, rng=player_count)
+                GoFishFactory.run_silent_game(player_count=player_count, compact=True)
+        self.assertEqual(output.getvalue(), '')
+
+    def test_card_encoding(self):
+        self.assertEqual([decode(encode(card)) for card in BASE_DECK], list(BASE_DECK))
+
+    def test_profiler(self):
+        profiler = TurnProfiler()
+        b_game = GoFishFactory.run_silent_game(player_count=4, rng=3, profiler=profiler)
+        summary = profiler.summary()
+        self.assertEqual(set(summary), set(PHASES))
+        ask_calls = sum(timing['calls'] for timing in summary['ask'].values())
+        self.assertEqual(ask_calls, sum(timing['calls'] for timing in summary['book'].values()))
+        self.assertLessEqual(ask_calls, b_game.turns)
+
+    def test_snapshot_restore(self):
+        b_game = GoFishFactory.build_basic_game(player_count=4, rng=8)
+        for i in range(20):
+            b_game.do_turn()
+        state = b_game.snapshot()
+        rng_state = b_game.rng.getstate()
+        b_game.do_full_round()
+        books = [p.books for p in b_game.players]
+
+        b_game.restore(state)
+        self.assertEqual(b_game.snapshot(), state)
+        self.assertFalse(b_game.done)
+
+        # With the same random numbers, the game plays out the same way again.
+        b_game.rng.setstate(rng_state)
+        b_game.do_full_round()
+        self.assertEqual([p.books for p in b_game.players], books)
+
+    def test_deal(self):
+        b_game = GoFishFactory.build_basic_game(player_count=3)
+        dealt = [card for p in b_game.players for card in p.hand]
+        self.assertTrue(all(len(p.hand) == 7 for p in b_game.players))
+        self.assertEqual(sorted(dealt + list(b_game.deck)), sorted(BASE_DECK))
+
+
+class RulesTestCase(unittest.TestCase):
+    def test_tables(self):
+        self.assertEqual(STANDARD.hand_size(4), 7)
+        self.assertEqual(STANDARD.hand_size(5), 5)
+        self.assertEqual(len(STANDARD.deck), 52)
+        self.assertEqual(STANDARD.max_books, 13)
+        self.assertEqual(Rules(decks=2, hand_size={3: 12}).hand_size(3), 12)
+        self.assertEqual(Rules(decks=2).max_books, 26)
+        self.assertEqual(Rules(), STANDARD)
+
+    def test_bounds(self):
+        self.assertRaises(ValueError, Rules, book_size=5)
+        self.assertRaises(ValueError, Rules, hand_size={10: 6})
+        self.assertRaises(ValueError, STANDARD.hand_size, 11)
+        self.assertRaises(ValueError, GoFishFactory.build_basic_game, player_count=3,
+                          rules=Rules(min_players=4))
+        self.assertRaises(ValueError, GoFishFactory.build_basic_game,
+                          seat_types=(StingyPlayer, StingyPlayer))
+
+    def test_variant_games(self):
+        for rules in (Rules(decks=2), Rules(book_size=3), Rules(decks=3, book_size=5)):
+            for compact in (False, True):
+                b_game = GoFishFactory.run_silent_game(player_count=5, rng=3, compact=compact,
+                                                       rules=rules)
+                self.assertTrue(b_game.done)
+                books = sum(len(player.books) for player in b_game.players)
+                self.assertEqual(books, rules.max_books)
+
+    def test_turn_limit(self):
+        b_game = GoFishFactory.run_silent_game(player_count=4, rng=1, rules=Rules(turn_limit=5))
+        self.assertEqual(b_game.turns, 5)
+
+    def test_deny_limit(self):
+        b_game = GoFishFactory.build_basic_game(seat_types=(StingyPlayer, DumbPlayer),
+                                                rules=Rules(deny_limit=0))
+        self.assertEqual(b_game.players[0].deny_limit, 0)
+        self.assertEqual(type(b_game.players[1]), DumbPlayer)
+        self.assertEqual(StingyPlayer(None, limit=3).deny_limit, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
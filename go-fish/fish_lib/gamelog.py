@@ -0,0 +1,133 @@
+"""
+A compact binary log of Go Fish games and a replayer for it.
+
+Every event is one fixed-width record: a kind, two seat numbers and a value,
+packed with struct. Cards are written in their compact form (see cards.encode)
+and faces as rank indices. A game starts with a START record, which holds the
+number of players and the book size, and the cards that were dealt, and ends
+with an END record that holds the number of turns.
+
+The replayer rebuilds the final hands and books of every game from the records
+alone, without running any player code.
+"""
+from collections import namedtuple
+import struct
+
+from .cards import BASE_DECK, RANK_INDEX, RANKS, encode
+from .observers import GameObserver
+
+# kind, seat, other seat, value
+RECORD = struct.Struct('<BBBxI')
+
+START, DEAL, ASK, GIVE, DRAW, BOOK, END = range(7)
+
+# Lookups from cards and faces to what is written. Compact cards and faces are
+# written as they are, so ranges stand in for them.
+CARD_CODES = {card: encode(card) for card in BASE_DECK}
+COMPACT_CODES = range(len(BASE_DECK))
+COMPACT_FACES = range(len(RANKS))
+
+# The result of replaying one game. hands has a sorted tuple of compact cards for
+# every seat, books has a tuple of rank indices for every seat, and winners has
+# the seats with the most books.
+ReplayedGame = namedtuple('ReplayedGame', ['player_count', 'hands', 'books', 'winners',
+                                           'turns'])
+
+
+class BinaryLogObserver(GameObserver):
+    """
+    Writes every event of a game as binary records to a stream.
+
+    The records of a game are kept in memory and written all at once when the game
+    ends, so there is one write per game. One observer can log many games in a row.
+    """
+
+    def __init__(self, stream):
+        """
+        :param stream: A binary file, opened for writing or appending.
+        """
+        self.stream = stream
+        self._buffer = bytearray()
+        self._seats = {}
+        self._cards = CARD_CODES
+        self._faces = RANK_INDEX
+
+    def on_start(self, game):
+        self._buffer = bytearray()
+        self._seats = {player: i for i, player in enumerate(game.players)}
+        if game.compact:
+            self._cards, self._faces = COMPACT_CODES, COMPACT_FACES
+        else:
+            self._cards, self._faces = CARD_CODES, RANK_INDEX
+
+        pack = RECORD.pack
+        buffer = self._buffer
+        buffer += pack(START, len(game.players), game.rules.book_size, int(game.compact))
+        for seat, player in enumerate(game.players):
+            for card in player.hand:
+                buffer += pack(DEAL, seat, 0, self._cards[card])
+
+    def on_ask(self, a_player, face, r_player):
+        self._buffer += RECORD.pack(ASK, self._seats[a_player], self._seats[r_player],
+                                    self._faces[face])
+
+    def on_give(self, a_player, face, r_player, cards):
+        self._buffer += RECORD.pack(GIVE, self._seats[r_player], self._seats[a_player],
+                                    self._faces[face])
+
+    def on_draw(self, player, card):
+        self._buffer += RECORD.pack(DRAW, self._seats[player], 0, self._cards[card])
+
+    def on_book(self, player, face):
+        self._buffer += RECORD.pack(BOOK, self._seats[player], 0, self._faces[face])
+
+    def on_end(self, game):
+        self._buffer += RECORD.pack(END, 0, 0, game.turns)
+        self.stream.write(self._buffer)
+        self._buffer = bytearray()
+
+
+def replay(data):
+    """
+    Rebuilds the final state of every game in a log.
+    :param data: The bytes of a log written by BinaryLogObserver.
+    :return: A generator of ReplayedGame, one for every game in the log.
+    """
+    hands = books = None
+    book_size = 0
+    for kind, seat, other, value in RECORD.iter_unpack(data):
+        if kind == START:
+            # Every hand is a dict of rank index: list of compact cards.
+            hands = [{} for _ in range(seat)]
+            books = [[] for _ in range(seat)]
+            book_size = other
+        elif kind == DEAL or kind == DRAW:
+            hands[seat].setdefault(value >> 2, []).append(value)
+        elif kind == GIVE:
+            given = hands[seat].pop(value, [])
+            hands[other].setdefault(value, []).extend(given)
+        elif kind == BOOK:
+            cards = hands[seat][value]
+            del cards[-book_size:]
+            if not cards:
+                del hands[seat][value]
+            books[seat].append(value)
+        elif kind == END:
+            best = max(len(book) for book in books)
+            yield ReplayedGame(len(hands),
+                               tuple(tuple(sorted(card for cards in hand.values()
+                                                  for card in cards)) for hand in hands),
+                               tuple(tuple(book) for book in books),
+                               tuple(i for i, book in enumerate(books) if len(book) == best),
+                               value)
+
+
+def replay_file(path):
+    """
+    Rebuilds the final state of every game in a log file. See replay.
+    :param path: The path of the log file.
+    :return: A generator of ReplayedGame.
+    """
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    return replay(data)
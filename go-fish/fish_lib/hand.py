@@ -0,0 +1,184 @@
+"""
+The hand of cards that every Go Fish player holds.
+
+Author: Justin Smith
+"""
+from .cards import RANK_INDEX
+
+
+class Hand(object):
+    """
+    A hand of cards that keeps its cards grouped by face value.
+
+    Counting a face, handing over every card of a face and adding cards are all
+    O(1), so the game never has to scan a hand. It still acts like the old list
+    of cards: it can be iterated, indexed, appended to, extended and removed from.
+
+    Properties:
+        changed: The faces that had cards added since the last call of pop_changed.
+    """
+
+    def __init__(self, cards=None):
+        self._faces = {}  # Data is stored as face value: list of cards with that face.
+        self._size = 0
+        self.changed = {}  # Used as an ordered set.
+        if cards:
+            self.extend(cards)
+
+    @staticmethod
+    def face_of(card):
+        """
+        Gets the face value of a card.
+        :param card: The card tuple in format (RANK, SUIT).
+        :return: The face value of the card.
+        """
+        return card[0]
+
+    @staticmethod
+    def rank_of(face):
+        """
+        Gets the rank index of a face value, for tables that are indexed by rank.
+        :param face: A face value from face_of.
+        :return: An int from 0 to 12.
+        """
+        return RANK_INDEX[face]
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for cards in self._faces.values():
+            yield from cards
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if 0 <= index < self._size:
+            for cards in self._faces.values():
+                if index < len(cards):
+                    return cards[index]
+                index -= len(cards)
+        raise IndexError('Hand index out of range.')
+
+    def __contains__(self, card):
+        return card in self._faces.get(self.face_of(card), ())
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return 'Hand({!r})'.format(list(self))
+
+    def append(self, card):
+        """
+        Adds a single card to the hand.
+        :param card: The card to add.
+        """
+        face = self.face_of(card)
+        cards = self._faces.get(face)
+        if cards is None:
+            self._faces[face] = [card]
+        else:
+            cards.append(card)
+        self._size += 1
+        self.changed[face] = None
+
+    def extend(self, cards):
+        """
+        Adds every card in cards to the hand.
+        :param cards: An iterable of cards.
+        """
+        for card in cards:
+            self.append(card)
+
+    def remove(self, card):
+        """
+        Removes a single card from the hand.
+        Raises ValueError if the card is not in the hand.
+        :param card: The card to remove.
+        """
+        face = self.face_of(card)
+        cards = self._faces.get(face)
+        if cards is None or card not in cards:
+            raise ValueError('{!r} is not in the hand.'.format(card))
+        cards.remove(card)
+        if not cards:
+            del self._faces[face]
+        self._size -= 1
+
+    def count(self, face):
+        """
+        Counts how many copies we have of a certain face card.
+        :param face: A face value of a card.
+        :return: the number of copies.
+        """
+        cards = self._faces.get(face)
+        return len(cards) if cards else 0
+
+    def faces(self):
+        """
+        :return: A view of every face value that is in the hand.
+        """
+        return self._faces.keys()
+
+    def take(self, face, count=None):
+        """
+        Removes the cards with a certain face value from the hand.
+        :param face: A face value of a card.
+        :param count: The most cards to take. If None, every card of face is taken.
+        :return: A list of the removed cards. Empty if there were none.
+        """
+        if count is not None and count < self.count(face):
+            cards = self._faces[face]
+            taken = cards[-count:]
+            del cards[-count:]
+            self._size -= count
+            return taken
+        cards = self._faces.pop(face, None)
+        if cards is None:
+            return []
+        self._size -= len(cards)
+        return cards
+
+    def restore(self, cards):
+        """
+        Replaces every card in the hand with cards. Every face counts as changed.
+        :param cards: An iterable of cards, like the tuple(hand) of a snapshot.
+        """
+        self._faces = {}
+        self._size = 0
+        self.changed = {}
+        self.extend(cards)
+
+    def pop_changed(self):
+        """
+        Gets the faces that had cards added since the last call and then clears them.
+        :return: A dict whose keys are the changed face values.
+        """
+        changed = self.changed
+        self.changed = {}
+        return changed
+
+
+class CompactHand(Hand):
+    """
+    A hand of compact int cards. See cards.encode for the encoding.
+    """
+
+    @staticmethod
+    def face_of(card):
+        """
+        Gets the face value of a compact card.
+        :param card: An int from 0 to 51.
+        :return: The rank index of the card.
+        """
+        return card >> 2
+
+    @staticmethod
+    def rank_of(face):
+        """
+        Gets the rank index of a face value. Compact faces already are rank indices.
+        :param face: A face value from face_of.
+        :return: An int from 0 to 12.
+        """
+        return face
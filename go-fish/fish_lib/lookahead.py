@@ -0,0 +1,241 @@
+"""
+A Go Fish player that picks its ask by playing out many random games.
+
+For every ask it could make, the player deals the cards it can't see at random,
+makes the ask and plays the rest of the game with DumbPlayer moves. The ask that
+wins the most of these rollouts is the one it makes. The rollouts reuse a scratch
+game.BasicGoFish through snapshot and restore instead of building new objects.
+"""
+from collections import Counter, namedtuple
+from random import Random
+import threading
+import time
+
+from . import game
+from .players import DumbPlayer
+
+# Everything a rollout needs to know, as plain data so it can be sent to other processes.
+# hand_sizes, books and playing have one entry for every seat, and candidates is a tuple
+# of (face, target seat) asks.
+RolloutSpec = namedtuple('RolloutSpec', ['seat', 'hand', 'hand_sizes', 'books', 'playing',
+                                         'unknown', 'turns', 'candidates', 'compact', 'rules'])
+
+_local = threading.local()
+
+
+class RolloutPlayer(DumbPlayer):
+    """
+    A DumbPlayer whose next ask can be set ahead of time. Used in rollouts.
+    """
+
+    def __init__(self, hand, **kwargs):
+        super(RolloutPlayer, self).__init__(hand, **kwargs)
+        self.script = None
+
+    def ask_for_card(self, players: list):
+        """
+        Makes the ask in script if there is one, and then goes back to random asks.
+
+        See DumbPlayer.ask_for_card for description.
+        """
+        if self.script is not None:
+            face, seat = self.script
+            self.script = None
+            return face, self.game.players[seat]
+        return super().ask_for_card(players)
+
+
+def _scratch_game(player_count, compact, rules):
+    """
+    Gets the scratch game that this thread uses for rollouts, building it if needed.
+    :return: A game.BasicGoFish made of RolloutPlayers that share one random.Random.
+    """
+    games = getattr(_local, 'games', None)
+    if games is None:
+        games = _local.games = {}
+
+    key = (player_count, compact, rules)
+    if key not in games:
+        rng = Random()
+        b_players = [RolloutPlayer(None, name=str(i + 1), rng=rng) for i in range(player_count)]
+        games[key] = game.BasicGoFish(b_players, compact=compact, rng=rng, rules=rules)
+    return games[key]
+
+
+def run_rollouts(spec, count, seed, deadline=None):
+    """
+    Plays rollouts for every candidate ask in spec, taking turns between them.
+
+    This is the function that runs inside of a thread or process pool.
+
+    Parameters:
+        spec:
+            A RolloutSpec.
+        count:
+            The number of rollouts to play.
+        seed:
+            The seed of the rollouts.
+        deadline:
+            Stops early once time.perf_counter() is past this. If None, plays every
+            rollout. It is an absolute time so that jobs that wait in a queue don't get
+            a full time limit of their own.
+
+    :return: A tuple of a list of wins and a list of rollouts for every candidate.
+    """
+    scratch = _scratch_game(len(spec.hand_sizes), spec.compact, spec.rules)
+    scratch.rng.seed(seed)
+    rng = scratch.rng
+    me = scratch.players[spec.seat]
+
+    wins = [0.0] * len(spec.candidates)
+    plays = [0] * len(spec.candidates)
+    unknown = list(spec.unknown)
+    no_memory = (None,) * len(spec.hand_sizes)
+
+    for i in range(count):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        # Deal the cards we can't see to the other players and the deck.
+        rng.shuffle(unknown)
+        hands = []
+        dealt = 0
+        for seat, size in enumerate(spec.hand_sizes):
+            if seat == spec.seat:
+                hands.append(spec.hand)
+            else:
+                hands.append(unknown[dealt:dealt + size])
+                dealt += size
+        state = game.GameState(hands, (unknown[dealt:], 0), spec.books, spec.playing,
+                               spec.seat, spec.turns, no_memory)
+        scratch.restore(state)
+
+        candidate = i % len(spec.candidates)
+        me.script = spec.candidates[candidate]
+        scratch.do_full_round()
+
+        # A rollout that hit the turn limit has no winners, so it counts as a loss.
+        winners = scratch.winner or ()
+        if me in winners:
+            wins[candidate] += 1 / len(winners)
+        plays[candidate] += 1
+    return wins, plays
+
+
+class MonteCarloPlayer(DumbPlayer):
+    """
+    This player plays out random games for every ask it could make and picks the ask
+    that wins the most often. It hands over cards honestly, like a DumbPlayer.
+
+    Properties:
+        rollouts: The number of rollouts to play for every ask.
+        time_limit: The most seconds to spend on every ask. None for no limit.
+        executor: A concurrent.futures.Executor to spread the rollouts over.
+            If None, the rollouts are played in this thread.
+        chunk_size: The number of rollouts in every job sent to the executor.
+        last_rollouts: The number of rollouts played for the last ask.
+        last_elapsed: The seconds spent on the last ask.
+        total_rollouts: The number of rollouts played for every ask so far.
+    """
+
+    def __init__(self, hand, rollouts=200, time_limit=None, executor=None, chunk_size=50,
+                 **kwargs):
+        super(MonteCarloPlayer, self).__init__(hand, **kwargs)
+        self.rollouts = rollouts
+        self.time_limit = time_limit
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.last_rollouts = 0
+        self.last_elapsed = 0.0
+        self.total_rollouts = 0
+
+    def rollout_spec(self, players: list):
+        """
+        Gathers what this player can see of the game in to a RolloutSpec.
+        :param players: The players that are still playing.
+        :return: A RolloutSpec with every ask this player could make.
+        """
+        b_game = self.game
+        seats = {player: i for i, player in enumerate(b_game.players)}
+        hand_type = type(self.hand)
+
+        # Every card is unknown but the ones in this hand and the ones in books. With
+        # more than one deck the same card can be in both, so they are counted off.
+        rules = b_game.rules
+        known = Counter(self.hand)
+        booked = Counter()
+        for player in b_game.players:
+            for book in player.books:
+                booked[book] += rules.book_size
+        unknown = []
+        for card in (rules.compact_deck if b_game.compact else rules.deck):
+            face = hand_type.face_of(card)
+            if known[card]:
+                known[card] -= 1
+            elif booked[face]:
+                booked[face] -= 1
+            else:
+                unknown.append(card)
+
+        candidates = tuple((face, seats[player]) for face in self.hand.faces()
+                           for player in players if player is not self)
+
+        return RolloutSpec(seats[self],
+                           tuple(self.hand),
+                           tuple(len(player.hand) for player in b_game.players),
+                           tuple(tuple(player.books) for player in b_game.players),
+                           tuple(player.playing for player in b_game.players),
+                           tuple(unknown),
+                           b_game.turns,
+                           candidates,
+                           b_game.compact,
+                           rules)
+
+    def ask_for_card(self, players: list):
+        """
+        Plays rollouts for every ask that can be made and makes the one that won the most.
+
+        Parameters:
+            players:
+                A list of players in the same game with him.
+
+        :return: A tuple with 2 elements, a face value and the player to request the card from.
+        """
+        start = time.perf_counter()
+        deadline = None if self.time_limit is None else start + self.time_limit
+        spec = self.rollout_spec(players)
+        if len(spec.candidates) == 1:
+            self.last_rollouts = 0
+            self.last_elapsed = time.perf_counter() - start
+            face, seat = spec.candidates[0]
+            return face, self.game.players[seat]
+
+        total = self.rollouts * len(spec.candidates)
+        wins = [0.0] * len(spec.candidates)
+        plays = [0] * len(spec.candidates)
+
+        if self.executor is None:
+            results = [run_rollouts(spec, total, self.rng.getrandbits(64), deadline)]
+        else:
+            jobs = []
+            # Chunks are rounded to whole passes over the candidates so each gets its share.
+            chunk = max(1, self.chunk_size // len(spec.candidates)) * len(spec.candidates)
+            for first in range(0, total, chunk):
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                jobs.append(self.executor.submit(run_rollouts, spec, min(chunk, total - first),
+                                                 self.rng.getrandbits(64), deadline))
+            results = [job.result() for job in jobs]
+
+        for c_wins, c_plays in results:
+            for i in range(len(wins)):
+                wins[i] += c_wins[i]
+                plays[i] += c_plays[i]
+
+        best = max(range(len(wins)), key=lambda i: wins[i] / plays[i] if plays[i] else -1)
+        self.last_rollouts = sum(plays)
+        self.last_elapsed = time.perf_counter() - start
+        self.total_rollouts += self.last_rollouts
+
+        face, seat = spec.candidates[best]
+        return face, self.game.players[seat]
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+import time
+
+from . import game, players
+from .lookahead import MonteCarloPlayer
+from .rules import Rules
+
+import unittest
+
+
+class MonteCarloPlayerTestCase(unittest.TestCase):
+    def play(self, **kwargs):
+        rng = Random(4)
+        self.player = MonteCarloPlayer(None, name='1', rng=rng, rollouts=5, **kwargs)
+        b_players = [self.player] + [players.DumbPlayer(None, name=str(i + 2), rng=rng)
+                                     for i in range(2)]
+        b_game = game.BasicGoFish(b_players, rng=rng)
+        b_game.do_full_round()
+        return b_game
+
+    def test_full_game(self):
+        b_game = self.play()
+        self.assertTrue(b_game.done)
+        self.assertEqual(sum(len(p.books) for p in b_game.players), 13)
+        self.assertGreater(self.player.total_rollouts, 0)
+
+    def test_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            b_game = self.play(executor=pool, chunk_size=4)
+        self.assertTrue(b_game.done)
+
+    def test_turn_limit(self):
+        for turn_limit in (20, 40, 60):
+            rng = Random(4)
+            player = MonteCarloPlayer(None, name='1', rng=rng, rollouts=5)
+            b_players = [player] + [players.DumbPlayer(None, name=str(i + 2), rng=rng)
+                                    for i in range(2)]
+            b_game = game.BasicGoFish(b_players, rng=rng, rules=Rules(turn_limit=turn_limit))
+            b_game.do_full_round()
+            self.assertLessEqual(b_game.turns, turn_limit)
+            self.assertGreater(player.total_rollouts, 0)
+
+    def timed_ask(self, **kwargs):
+        rng = Random(4)
+        player = MonteCarloPlayer(None, name='1', rng=rng, rollouts=100000, time_limit=0.05,
+                                  **kwargs)
+        b_players = [player] + [players.DumbPlayer(None, name=str(i + 2), rng=rng)
+                                for i in range(2)]
+        game.BasicGoFish(b_players, rng=rng)
+        start = time.perf_counter()
+        player.ask_for_card(b_players)
+        self.assertLess(time.perf_counter() - start, 0.05 + 0.5)
+        self.assertGreater(player.last_rollouts, 0)
+        self.assertLess(player.last_rollouts, 100000)
+
+    def test_time_limit(self):
+        self.timed_ask()
+
+    def test_time_limit_executor(self):
+        # Every queued chunk has to stop at the same deadline, not get a time limit of its own.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            self.timed_ask(executor=pool, chunk_size=20)
+
+
+if __name__ == '__main__':
+    unittest.main()
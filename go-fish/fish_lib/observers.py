@@ -0,0 +1,117 @@
+"""
+Observers that get told about everything that happens in a game of Go Fish.
+
+A game with no observer skips all of the calls, so nothing is formatted or
+printed when a game is ran silently.
+"""
+from .cards import decode, face_name
+
+
+class GameObserver(object):
+    """
+    This class shows the events that a game reports. Every method does nothing,
+    so subclasses only have to replace the ones they care about.
+    """
+
+    def on_start(self, game):
+        """
+        Called once the cards have been dealt, before the first turn.
+        :param game: The game.BasicGoFish that is starting.
+        """
+        pass
+
+    def on_end(self, game):
+        """
+        Called when do_full_round is done.
+        :param game: The game.BasicGoFish that ended.
+        """
+        pass
+
+    def on_turn(self, turn):
+        """
+        Called at the start of every turn.
+        :param turn: The number of the turn, starting at 1.
+        """
+        pass
+
+    def on_ask(self, a_player, face, r_player):
+        """
+        Called when the active player asks another player for a card.
+
+        Arguments:
+            a_player:
+                The active player at the time of call.
+            face:
+                The face value of the requested card.
+            r_player:
+                The player that was asked for face.
+        """
+        pass
+
+    def on_give(self, a_player, face, r_player, cards):
+        """
+        Called when r_player hands over cards to the active player.
+
+        Arguments:
+            a_player:
+                The active player at the time of call.
+            face:
+                The face value of the requested card.
+            r_player:
+                The player that gave up the cards.
+            cards:
+                The cards that were handed over.
+        """
+        pass
+
+    def on_go_fish(self, a_player, face, r_player):
+        """
+        Called when r_player didn't hand over any cards.
+
+        See GameObserver.on_ask for description of arguments.
+        """
+        pass
+
+    def on_draw(self, player, card):
+        """
+        Called when a player draws a card from the deck.
+        :param player: The player who drew the card.
+        :param card: The card that was drawn.
+        """
+        pass
+
+    def on_book(self, player, face):
+        """
+        Called when a player makes a book.
+        :param player: The player who made the book.
+        :param face: The face value of the book.
+        """
+        pass
+
+
+class PrintObserver(GameObserver):
+    """
+    Prints every event as a human-readable line.
+    """
+
+    def on_turn(self, turn):
+        print('\nTurn {}\n{}'.format(turn, '-' * 15))
+
+    def on_ask(self, a_player, face, r_player):
+        print('Player {} asked for a {} from Player {}.'.format(a_player.name, face_name(face),
+                                                                r_player.name))
+
+    def on_give(self, a_player, face, r_player, cards):
+        print('Player {} gained {} {}(s) with {} in hand.'.format(a_player.name,
+                                                                  len(cards),
+                                                                  face_name(face),
+                                                                  a_player.count_copies(face)))
+
+    def on_go_fish(self, a_player, face, r_player):
+        print('Player {} didn\'t have a {}.'.format(r_player.name, face_name(face)))
+
+    def on_draw(self, player, card):
+        print('Player {} drew a {}.'.format(player.name, decode(card)[0]))
+
+    def on_book(self, player, face):
+        print('Player {} made a book of {}\'s.'.format(player.name, face_name(face)))
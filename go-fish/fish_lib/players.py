@@ -4,7 +4,10 @@ The types of players that can be found in a game of Go Fish.
 Author: Justin Smith
 Date: 1/23/18
 """
-from random import choice
+import random
+
+from .cards import RANKS, face_name
+from .hand import Hand
 
 
 class BasePlayer(object):
@@ -19,6 +22,19 @@ class BasePlayer(object):
         self.hand = hand
         self.name = kwargs.get('name', repr(self))
         self.playing = True
+        self.rng = kwargs.get('rng') or random
+        self.game = None  # Set by the game the player sits down at.
+
+    @property
+    def hand(self):
+        """
+        The player's hand.Hand. Setting it to a list of cards wraps them in a Hand.
+        """
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        self._hand = cards if isinstance(cards, Hand) else Hand(cards)
 
     def count_copies(self, face):
         """
@@ -26,10 +42,28 @@ class BasePlayer(object):
         :param face: A face value of a card.
         :return: the number of copies.
         """
-        result = 0
-        for card in self.hand:
-            result += 1 if card[0] == face else 0
-        return result
+        return self._hand.count(face)
+
+    def snapshot_memory(self):
+        """
+        Saves whatever the player remembers about the game, for game.BasicGoFish.snapshot.
+        Players that don't remember anything return None.
+        :return: An immutable copy of the player's memory.
+        """
+        return None
+
+    def restore_memory(self, memory):
+        """
+        Puts the player's memory back to what snapshot_memory returned.
+        :param memory: The result of snapshot_memory.
+        """
+        pass
+
+    def reset_memory(self):
+        """
+        Forgets everything the player remembers, for a new game.
+        """
+        pass
 
     def ask_for_card(self, players: list):
         """
@@ -102,7 +136,8 @@ class DumbPlayer(BasePlayer):
 
         :return: A tuple with 2 elements, a face value and the player to request the card from.
         """
-        return choice(self.hand)[0], choice([x for x in players if x != self])
+        return (self.hand.face_of(self.rng.choice(self.hand)),
+                self.rng.choice([x for x in players if x != self]))
 
     def confirm_ask(self, face):
         """
@@ -116,11 +151,7 @@ class DumbPlayer(BasePlayer):
 
         :return: All of the cards that have the same face value.
         """
-        given_cards = []
-        for i in list(filter(lambda c: c[0] == face, self.hand)):
-            self.hand.remove(i)
-            given_cards.append(i)
-        return given_cards
+        return self.hand.take(face)
 
     def hear_ask(self, a_player, face, r_player):
         """
@@ -144,10 +175,35 @@ class TryingPlayer(DumbPlayer):
     This player will track who made what calls for cards. If they've heard a
     call for a card they need, they mark the player who made it as a target.
     Also, this player follows the rules of the game.
+
+    Properties:
+        holders: A list of the player last seen asking for every rank, indexed by rank.
+        known: A bitset of the ranks in holders that are still worth asking for.
     """
     def __init__(self, hand, **kwargs):
         super(TryingPlayer, self).__init__(hand, **kwargs)
-        self.seen = {}  # Data is stored as face value: player last seen with it.
+        self.holders = [None] * len(RANKS)
+        self.known = 0
+
+    def snapshot_memory(self):
+        """
+        :return: A tuple of the known bitset and the holders.
+        """
+        return self.known, tuple(self.holders)
+
+    def restore_memory(self, memory):
+        """
+        Puts back the known bitset and the holders from snapshot_memory.
+        """
+        self.known, holders = memory
+        self.holders[:] = holders
+
+    def reset_memory(self):
+        """
+        Forgets every holder.
+        """
+        self.known = 0
+        self.holders[:] = [None] * len(RANKS)
 
     def ask_for_card(self, players: list):
         """
@@ -161,17 +217,29 @@ class TryingPlayer(DumbPlayer):
                 likely included.
         :return: A tuple with 2 elements, a face value and the player to request the card from.
         """
-        # Find out which targets have cards that we've seen before.
-        poss_targets = set(self.seen.keys()).intersection((card[0] for card in self.hand))
-
-        # Also find out if they are still in the game.
-        poss_targets = list(filter(lambda f: self.seen.get(f) in players, poss_targets))
-
-        # If the targets have cards that we have, let's try to go for them.
-        if poss_targets:
-            selected_face = choice(poss_targets)
-            selected_player = self.seen.pop(selected_face)
-            return selected_face, selected_player
+        known = self.known
+        if known:
+            holders = self.holders
+            rank_of = self.hand.rank_of
+
+            # Count the faces in our hand that we've seen someone still playing ask for.
+            # This goes in hand order so a seeded game always makes the same choice.
+            count = 0
+            for face in self.hand.faces():
+                rank = rank_of(face)
+                if known >> rank & 1 and holders[rank].playing:
+                    count += 1
+
+            # If the targets have cards that we have, let's try to go for them.
+            if count:
+                pick = self.rng.randrange(count)
+                for face in self.hand.faces():
+                    rank = rank_of(face)
+                    if known >> rank & 1 and holders[rank].playing:
+                        if not pick:
+                            self.known = known & ~(1 << rank)
+                            return face, holders[rank]
+                        pick -= 1
 
         # If we can't make a informed play, make a unpredictable play.
         return super().ask_for_card(players)
@@ -180,39 +248,69 @@ class TryingPlayer(DumbPlayer):
         """
         This method will log whoever ask for a card as the latest owner of that face value.
 
-        This sets the dictionary value of face equal to a_player.
+        This sets the holder of face's rank to a_player.
 
         See BasePlayer.hear_ask for detailed description of arguments.
         """
-        self.seen[face] = a_player
+        rank = self.hand.rank_of(face)
+        self.holders[rank] = a_player
+        self.known |= 1 << rank
 
     def hear_confirm(self, a_player, face, r_player, result):
         """
-        This method will determine whether or not to clear the entry in seen for face.
-
-        If result is true, then their entry will be clear from seen if they have the book.
+        This method does nothing. A face that the asker makes a book of leaves every
+        hand, so it can't be one of our candidates again and doesn't need forgetting.
 
         See BasePlayer.hear_confirm for detailed description of arguments.
         """
-
-        if result and a_player.count_copies(face) == 4:
-            self.seen[face] = None
+        pass
 
 
 class StingyPlayer(DumbPlayer):
     """
     This player will lie about having cards in order to hold on to them. (aka be stingy.)
-    They will deny having the same face up to 2 times in the same game before giving up.
-    Games should limit themselves to one StringyPlayer in case of deadlock.
+    They will deny having the same face up to deny_limit times in the same game before
+    giving up. Games should limit themselves to one StringyPlayer in case of deadlock.
     """
 
     LIMIT = 1
 
-    def __init__(self, hand, limit=2, **kwargs):
+    def __init__(self, hand, limit=None, **kwargs):
+        """
+        :param limit: How many times to deny each face. If None, the deny_limit of the
+                      game's rules is used, or 2 before the player sits down.
+        """
         super(StingyPlayer, self).__init__(hand, **kwargs)
-        self.deny_limit = limit
+        self.limit = limit
         self.denied = {}
 
+    @property
+    def deny_limit(self):
+        """
+        How many times this player denies each face.
+        """
+        if self.limit is not None:
+            return self.limit
+        return self.game.rules.deny_limit if self.game is not None else 2
+
+    def snapshot_memory(self):
+        """
+        :return: The denied dictionary as a tuple of items.
+        """
+        return tuple(self.denied.items())
+
+    def restore_memory(self, memory):
+        """
+        Rebuilds the denied dictionary from snapshot_memory.
+        """
+        self.denied = dict(memory)
+
+    def reset_memory(self):
+        """
+        Forgets every denial.
+        """
+        self.denied.clear()
+
     def confirm_ask(self, face):
         """
         Returns nothing if they haven't denied it twice already.
@@ -254,16 +352,17 @@ class UserPlayer(DumbPlayer):
                 likely included.
         :return: A tuple with 2 elements, a face value and the player to request the card from.
         """
-        # Let's get the faces in the hand.
+        # Let's get the faces in the hand by the name the user will type.
         faces = {}
 
-        for card in self.hand:
-            faces[card[0]] = self.count_copies(card[0])
+        for face in self.hand.faces():
+            faces[face_name(face)] = face
 
         def print_info():
             for idx, player in enumerate(players):
                 print('{0}) Player {1}'.format(idx, player.name))
-            face_str_args = ('{1} {0}\'s'.format(*item) for item in faces.items())
+            face_str_args = ('{1} {0}\'s'.format(name, self.count_copies(face))
+                             for name, face in faces.items())
             print('Your hand: {}'.format(', '.join(face_str_args)))
 
         players = [player for player in players if player != self]
@@ -287,7 +386,7 @@ class UserPlayer(DumbPlayer):
                 print('That card is not in your hand!')
             r_card = input('What card would you like to ask for? ')
 
-        return r_card, players[player_index]
+        return faces[r_card], players[player_index]
 
     def confirm_ask(self, face):
         """
@@ -303,14 +402,14 @@ class UserPlayer(DumbPlayer):
 
         :return: An empty list or a list of the cards requested.
         """
-        print('You were asked for a {}.'.format(face))
+        print('You were asked for a {}.'.format(face_name(face)))
         posess = self.count_copies(face)
         print('You have {}.'.format(posess))
 
         if posess:
             if input('Do you give up your cards? [Y/n] ').lower().strip() == 'n':
-                print('You denied that you have a {}.'.format(face))
+                print('You denied that you have a {}.'.format(face_name(face)))
                 return []
             else:
-                print('You gave up your {} {}(s).'.format(posess, face))
+                print('You gave up your {} {}(s).'.format(posess, face_name(face)))
                 return super().confirm_ask(face)
@@ -0,0 +1,78 @@
+"""
+Lightweight timers for the phases of a Go Fish turn.
+
+A game only times itself when it is given a TurnProfiler. Every phase is timed
+with time.perf_counter_ns and charged to the type of the player who ran it, so
+the summary shows which strategy's hooks cost the most. One profiler can be
+shared by many games to add up their timings.
+"""
+import json
+from time import perf_counter_ns
+
+PHASES = ('ask', 'confirm', 'broadcast', 'draw', 'book')
+
+
+class TurnProfiler(object):
+    """
+    Adds up the time spent and the number of calls of every phase of a turn.
+
+    Phases:
+        ask: The active player's ask_for_card.
+        confirm: The asked player's confirm_ask.
+        broadcast: Every other player's hear_ask and hear_confirm.
+        draw: Drawing from the deck after a failed ask.
+        book: Checking the active player for books.
+    """
+
+    clock = staticmethod(perf_counter_ns)
+
+    def __init__(self):
+        self.timings = {}  # Data is stored as (phase, player type name): [total ns, calls].
+
+    def record(self, phase, player, elapsed):
+        """
+        Adds one call of a phase.
+
+        Parameters:
+            phase:
+                One of PHASES.
+            player:
+                The player whose code ran in the phase.
+            elapsed:
+                The time the phase took in nanoseconds.
+        """
+        key = (phase, type(player).__name__)
+        timing = self.timings.get(key)
+        if timing is None:
+            self.timings[key] = [elapsed, 1]
+        else:
+            timing[0] += elapsed
+            timing[1] += 1
+
+    def merge(self, other):
+        """
+        Adds every timing of another profiler to this one.
+        :param other: Another TurnProfiler.
+        """
+        for key, (elapsed, calls) in other.timings.items():
+            timing = self.timings.setdefault(key, [0, 0])
+            timing[0] += elapsed
+            timing[1] += calls
+
+    def summary(self):
+        """
+        :return: A dict of phase: player type name: dict of calls, total_ns and mean_ns.
+        """
+        result = {}
+        for (phase, player_type), (elapsed, calls) in sorted(self.timings.items()):
+            result.setdefault(phase, {})[player_type] = {'calls': calls,
+                                                         'total_ns': elapsed,
+                                                         'mean_ns': elapsed / calls}
+        return result
+
+    def to_json(self, **kwargs):
+        """
+        :param kwargs: Passed along to json.dumps.
+        :return: The summary as a JSON string.
+        """
+        return json.dumps(self.summary(), **kwargs)
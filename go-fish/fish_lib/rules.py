@@ -0,0 +1,135 @@
+"""
+The house rules of a game of Go Fish.
+
+A Rules object holds every number that the game used to have written in to it:
+how many decks are shuffled together, how many cards make a book, how many cards
+are dealt, how often a StingyPlayer denies a face and how long a game may run.
+The decks and the hand size of every player count are built once when the rules
+are made, so games that share a Rules object don't build them again.
+
+Author: Justin Smith
+"""
+from array import array
+
+from .cards import BASE_DECK, COMPACT_DECK, RANKS, SUITS
+
+
+class Rules(object):
+    """
+    A set of Go Fish rules. Rules are compared and hashed by their settings, so they
+    can be used as keys.
+
+    Properties:
+        decks: The number of decks shuffled together.
+        book_size: The number of cards of one face that make a book.
+        deny_limit: How many times a StingyPlayer denies each face, unless it was given
+            its own limit.
+        turn_limit: The most turns a game may run, in case of logic failure.
+        min_players: The fewest players a game can have.
+        max_players: The most players a game can have.
+        copies: The number of cards of every face in the deck.
+        deck: A list of every card tuple in the deck.
+        compact_deck: An array of every compact card in the deck. See cards.encode.
+        hand_sizes: A tuple of the hand size of every player count, indexed by the count.
+        max_books: The number of books there are to make in a game.
+        leftover: The number of cards of every face that can't be part of a book. Games
+            with leftover cards end once every book is made, since the players would
+            otherwise ask for the leftovers forever.
+    """
+
+    def __init__(self, decks=1, book_size=len(SUITS), hand_size=None, deny_limit=2,
+                 turn_limit=100000, min_players=2, max_players=10):
+        """
+        Parameters:
+            decks:
+                The number of decks shuffled together.
+            book_size:
+                The number of cards of one face that make a book. Has to be at least 2
+                and at most the number of copies of a face in the deck.
+            hand_size:
+                A dict of player count: cards dealt to every player. Player counts that
+                are left out are dealt 7 cards with 4 players or less, and 5 otherwise.
+            deny_limit:
+                How many times a StingyPlayer denies each face.
+            turn_limit:
+                The most turns a game may run.
+            min_players:
+                The fewest players a game can have.
+            max_players:
+                The most players a game can have.
+        """
+        if decks < 1:
+            raise ValueError('There has to be at least one deck.')
+        if min_players < 2 or max_players < min_players:
+            raise ValueError('Player bounds are out of range! 2 <= min_players <= max_players.')
+
+        self.decks = decks
+        self.book_size = book_size
+        self.deny_limit = deny_limit
+        self.turn_limit = turn_limit
+        self.min_players = min_players
+        self.max_players = max_players
+
+        self.copies = len(SUITS) * decks
+        if not 2 <= book_size <= self.copies:
+            raise ValueError('Book size is out of range! 2 <= book_size <= {}.'.format(
+                self.copies))
+
+        self.deck = list(BASE_DECK) * decks
+        self.compact_deck = array('B', COMPACT_DECK) * decks
+        self.max_books = len(RANKS) * (self.copies // book_size)
+        self.leftover = self.copies % book_size
+
+        hand_size = dict(hand_size or {})
+        sizes = [0] * (max_players + 1)
+        for count in range(min_players, max_players + 1):
+            sizes[count] = hand_size.get(count, 7 if count <= 4 else 5)
+            if sizes[count] * count > len(self.deck):
+                raise ValueError('A deck of {} cards can\'t deal {} cards to {} players.'.format(
+                    len(self.deck), sizes[count], count))
+        self.hand_sizes = tuple(sizes)
+        self._hand_size = tuple(sorted(hand_size.items()))
+
+    @property
+    def key(self):
+        """
+        A tuple of every setting the rules were made with.
+        """
+        return (self.decks, self.book_size, self._hand_size, self.deny_limit,
+                self.turn_limit, self.min_players, self.max_players)
+
+    def __eq__(self, other):
+        return isinstance(other, Rules) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return ('Rules(decks={}, book_size={}, hand_size={}, deny_limit={}, turn_limit={}, '
+                'min_players={}, max_players={})').format(self.decks, self.book_size,
+                                                          dict(self._hand_size),
+                                                          self.deny_limit, self.turn_limit,
+                                                          self.min_players, self.max_players)
+
+    def check_player_count(self, player_count):
+        """
+        Raises ValueError if a game can't have player_count players.
+        :param player_count: The number of players.
+        """
+        if player_count > self.max_players or player_count < self.min_players:
+            raise ValueError('Player count is out of range! {} <= player_count <= {}.'.format(
+                self.min_players, self.max_players))
+
+    def hand_size(self, player_count):
+        """
+        Gets the number of cards dealt to every player.
+        Raises ValueError if a game can't have player_count players.
+        :param player_count: The number of players.
+        :return: The number of cards.
+        """
+        self.check_player_count(player_count)
+        return self.hand_sizes[player_count]
+
+
+# The rules that every game uses unless it is given its own.
+STANDARD = Rules()
@@ -0,0 +1,308 @@
+"""
+An asyncio host that runs many tables of Go Fish at once.
+
+Every connection, over TCP or a Unix socket, sits one person down at a new table
+with computer players in the other seats. The table is a game.BasicGoFish that is
+played phase by phase with begin_turn, announce_ask and end_turn, so the table
+waits on the person without blocking any other table. The computer seats are
+played inline, and a table gives the other tables a chance to run after every turn.
+
+Messages are JSON objects, one per line. The client starts with
+
+    {"type": "join", "name": "Ann", "players": 4}
+
+and then the host sends events and questions:
+
+    {"type": "start", "players": [...], "hand": [...]}
+    {"type": "ask", "hand": [...], "players": [...]}       answer {"face": "King", "player": "3"}
+    {"type": "confirm", "face": "King", "by": "3", "count": 2}   answer {"give": true}
+    {"type": "asked" | "gave" | "go_fish" | "draw" | "book" | "error", ...}
+    {"type": "end", "winners": [...], "books": {...}}
+"""
+import asyncio
+import json
+import random
+
+from .cards import face_name
+from .factory import GoFishFactory
+from .game import BasicGoFish
+from .observers import GameObserver
+from .players import DumbPlayer, StingyPlayer, TryingPlayer
+
+
+class Connection(object):
+    """
+    Sends and receives JSON messages, one per line, over an asyncio stream pair.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def send(self, **message):
+        """
+        Queues a message to be sent. It goes out the next time the stream is drained.
+        """
+        self.writer.write(json.dumps(message).encode() + b'\n')
+
+    async def receive(self):
+        """
+        Waits for the next message.
+        Raises ConnectionError if the other side hung up.
+        :return: The message as a dict.
+        """
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError('The connection was closed.')
+        message = json.loads(line)
+        if not isinstance(message, dict):
+            raise ValueError('Messages have to be JSON objects.')
+        return message
+
+    async def request(self, **message):
+        """
+        Sends a message and waits for the answer.
+        :return: The answer as a dict.
+        """
+        self.send(**message)
+        await self.writer.drain()
+        return await self.receive()
+
+    async def close(self):
+        """
+        Sends everything that is queued and closes the connection.
+        """
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def hand_names(hand):
+    """
+    :return: A list of every card in a hand, as a person would say it.
+    """
+    return [BasicGoFish.card_to_string(card) for card in hand]
+
+
+class RemotePlayer(DumbPlayer):
+    """
+    This player is a person on the other end of a Connection. Their asks and confirms
+    are coroutines, so they can only be played by play_table.
+    """
+
+    def __init__(self, hand, connection=None, **kwargs):
+        super(RemotePlayer, self).__init__(hand, **kwargs)
+        self.connection = connection
+
+    def ask_for_card(self, players: list):
+        raise RuntimeError('A RemotePlayer can only ask through play_table.')
+
+    def confirm_ask(self, face):
+        raise RuntimeError('A RemotePlayer can only confirm through play_table.')
+
+    async def ask_for_card_async(self, players: list):
+        """
+        Asks the person which face to ask for and who to ask, until they make a valid ask.
+
+        See DumbPlayer.ask_for_card for description.
+        """
+        faces = {face_name(face): face for face in self.hand.faces()}
+        others = {player.name: player for player in players if player is not self}
+        while True:
+            reply = await self.connection.request(type='ask', hand=hand_names(self.hand),
+                                                  players=list(others))
+            face, target = faces.get(reply.get('face')), others.get(reply.get('player'))
+            if face is not None and target is not None:
+                return face, target
+            self.connection.send(type='error', message='Ask for a face in your hand from '
+                                                       'one of the players.')
+
+    async def confirm_ask_async(self, face):
+        """
+        Lets the person hand over their cards of face or deny having them, like a
+        UserPlayer. Nothing is asked if they have none.
+
+        See DumbPlayer.confirm_ask for description.
+        """
+        count = self.count_copies(face)
+        if not count:
+            return []
+        asker = self.game.players[self.game.active_player_idx]
+        reply = await self.connection.request(type='confirm', face=face_name(face),
+                                              by=asker.name, count=count)
+        if reply.get('give', True):
+            return self.hand.take(face)
+        return []
+
+
+class TableObserver(GameObserver):
+    """
+    Tells a RemotePlayer about everything that they can see happen at their table.
+    """
+
+    def __init__(self, player):
+        self.player = player
+
+    def send(self, **message):
+        self.player.connection.send(**message)
+
+    def on_start(self, game):
+        self.send(type='start', players=[player.name for player in game.players],
+                  hand=hand_names(self.player.hand))
+
+    def on_end(self, game):
+        self.send(type='end', winners=[player.name for player in game.winner or ()],
+                  books={player.name: len(player.books) for player in game.players})
+
+    def on_ask(self, a_player, face, r_player):
+        self.send(type='asked', by=a_player.name, face=face_name(face), of=r_player.name)
+
+    def on_give(self, a_player, face, r_player, cards):
+        self.send(type='gave', by=r_player.name, to=a_player.name, face=face_name(face),
+                  count=len(cards))
+
+    def on_go_fish(self, a_player, face, r_player):
+        self.send(type='go_fish', player=a_player.name)
+
+    def on_draw(self, player, card):
+        # Only the player who drew gets to see the card.
+        if player is self.player:
+            self.send(type='draw', card=BasicGoFish.card_to_string(card))
+
+    def on_book(self, player, face):
+        self.send(type='book', player=player.name, face=face_name(face))
+
+
+async def play_table(b_game):
+    """
+    Plays a game to the end like do_full_round, awaiting the players that have
+    ask_for_card_async and confirm_ask_async and calling the rest inline. The phases
+    time the turn for the game's profiler like in do_turn, so the time a person takes
+    to answer counts toward their ask or confirm.
+
+    :param b_game: A game.BasicGoFish.
+    :return: b_game, once it is done.
+    """
+    observer = b_game.observer
+    turn_limit = b_game.rules.turn_limit
+    while not b_game.done and b_game.turns < turn_limit:
+        if observer is not None:
+            observer.on_turn(b_game.turns + 1)
+
+        valid_players = b_game.begin_turn()
+        if valid_players is not None:
+            active_player = b_game.players[b_game.active_player_idx]
+            ask = getattr(active_player, 'ask_for_card_async', None)
+            if ask is None:
+                r_face, r_player = active_player.ask_for_card(valid_players)
+            else:
+                r_face, r_player = await ask(valid_players)
+
+            b_game.announce_ask(r_face, r_player)
+            confirm = getattr(r_player, 'confirm_ask_async', None)
+            if confirm is None:
+                won_cards = r_player.confirm_ask(r_face)
+            else:
+                won_cards = await confirm(r_face)
+            b_game.end_turn(r_face, r_player, won_cards)
+        b_game.turns += 1
+
+        # Lets the other tables run between turns that didn't have to wait.
+        await asyncio.sleep(0)
+
+    if observer is not None:
+        observer.on_end(b_game)
+    return b_game
+
+
+class GoFishServer(object):
+    """
+    Hosts a table for every connection.
+
+    Properties:
+        player_count: The number of seats at a table, unless the client asks for another.
+        player_types: The classes that the computer seats are picked from.
+        rules: The rules.Rules of every table. If None, uses rules.STANDARD.
+        profiler: A profiling.TurnProfiler that every table is timed with, or None.
+        open_tables: The number of tables being played right now.
+        finished_tables: The number of tables that were played to the end.
+    """
+
+    def __init__(self, player_count=4, player_types=(DumbPlayer, StingyPlayer, TryingPlayer),
+                 rules=None, rng=None, profiler=None):
+        """
+        See the properties for the parameters. rng is the random.Random or seed that
+        shuffles the decks and picks the computer seats.
+        """
+        self.player_count = player_count
+        self.player_types = player_types
+        self.rules = rules
+        self.profiler = profiler
+        self.rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+        self.open_tables = 0
+        self.finished_tables = 0
+
+    def build_table(self, connection, name, player_count):
+        """
+        Builds a table with a RemotePlayer for the connection in the first seat. The
+        computer seats are named "2" and up.
+        Raises ValueError if the table can't have player_count players, or if name is
+        taken by a computer seat.
+        :return: A game.BasicGoFish that hasn't started.
+        """
+        names = [str(i) for i in range(2, player_count + 1)]
+        if name in names:
+            raise ValueError('The name {} is taken by a computer player.'.format(name))
+        person = RemotePlayer(None, connection=connection, name=name)
+        seat_types = GoFishFactory.pick_seats(player_count - 1, self.player_types, self.rng)
+        b_players = [person] + [player_type(None, name=seat_name, rng=self.rng)
+                                for seat_name, player_type in zip(names, seat_types)]
+        return BasicGoFish(b_players, observer=TableObserver(person), rng=self.rng,
+                           profiler=self.profiler, rules=self.rules)
+
+    async def handle(self, reader, writer):
+        """
+        Plays one table for a new connection. Given to asyncio.start_server.
+        """
+        connection = Connection(reader, writer)
+        try:
+            hello = await connection.receive()
+            player_count = hello.get('players', self.player_count)
+            try:
+                b_game = self.build_table(connection, str(hello.get('name', '1')),
+                                          int(player_count))
+            except (TypeError, ValueError) as e:
+                connection.send(type='error', message=str(e))
+                return
+
+            self.open_tables += 1
+            try:
+                await play_table(b_game)
+            finally:
+                self.open_tables -= 1
+            self.finished_tables += 1
+        except (ConnectionError, ValueError):
+            # The person left or sent something that isn't JSON. The table is dropped.
+            pass
+        finally:
+            await connection.close()
+
+    async def start_tcp(self, host='127.0.0.1', port=0):
+        """
+        Starts listening on a TCP port. Port 0 picks a free one.
+        :return: The asyncio.Server.
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def start_unix(self, path):
+        """
+        Starts listening on a Unix socket.
+        :return: The asyncio.Server.
+        """
+        return await asyncio.start_unix_server(self.handle, path)
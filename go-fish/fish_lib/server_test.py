@@ -0,0 +1,151 @@
+from .factory import GoFishFactory
+from .profiling import TurnProfiler
+from .server import GoFishServer, play_table
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+
+async def stand_in(reader, writer, name='Ann', players=4, denials=0, bad_asks=0):
+    """
+    A client that plays like a DumbPlayer: it asks for its first face from the first
+    player it is offered. It can start with some invalid asks and denials.
+    :return: A list of every message it got.
+    """
+    messages = []
+    writer.write(json.dumps({'type': 'join', 'name': name, 'players': players}).encode() + b'\n')
+    await writer.drain()
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = json.loads(line)
+        messages.append(message)
+        if message['type'] == 'ask':
+            if bad_asks:
+                bad_asks -= 1
+                reply = {'face': 'Joker', 'player': message['players'][0]}
+            else:
+                reply = {'face': message['hand'][0].split(' of ')[0],
+                         'player': message['players'][0]}
+        elif message['type'] == 'confirm':
+            reply = {'give': not denials}
+            denials = max(0, denials - 1)
+        else:
+            continue
+        writer.write(json.dumps(reply).encode() + b'\n')
+        await writer.drain()
+    writer.close()
+    return messages
+
+
+class ServerTestCase(unittest.TestCase):
+    def test_many_tables(self):
+        async def run():
+            server = GoFishServer(rng=1)
+            listener = await server.start_tcp()
+            port = listener.sockets[0].getsockname()[1]
+
+            async def client(i):
+                return await stand_in(*await asyncio.open_connection('127.0.0.1', port),
+                                      players=2 + i % 5, denials=i % 3)
+
+            results = await asyncio.gather(*(client(i) for i in range(40)))
+            listener.close()
+            await listener.wait_closed()
+            return server, results
+
+        server, results = asyncio.run(run())
+        self.assertEqual(server.finished_tables, 40)
+        self.assertEqual(server.open_tables, 0)
+        for messages in results:
+            self.assertEqual(messages[0]['type'], 'start')
+            self.assertEqual(messages[-1]['type'], 'end')
+            self.assertEqual(sum(messages[-1]['books'].values()), 13)
+
+    def test_invalid_ask(self):
+        async def run():
+            server = GoFishServer(rng=2)
+            listener = await server.start_tcp()
+            port = listener.sockets[0].getsockname()[1]
+            messages = await stand_in(*await asyncio.open_connection('127.0.0.1', port),
+                                      bad_asks=2)
+            listener.close()
+            return messages
+
+        messages = asyncio.run(run())
+        self.assertEqual([m['type'] for m in messages].count('error'), 2)
+        self.assertEqual(messages[-1]['type'], 'end')
+
+    def test_bad_player_count(self):
+        async def run():
+            listener = await GoFishServer().start_tcp()
+            port = listener.sockets[0].getsockname()[1]
+            messages = await stand_in(*await asyncio.open_connection('127.0.0.1', port),
+                                      players=11)
+            listener.close()
+            return messages
+
+        messages = asyncio.run(run())
+        self.assertEqual([m['type'] for m in messages], ['error'])
+
+    def test_name_taken(self):
+        async def run(name):
+            listener = await GoFishServer(rng=4).start_tcp()
+            port = listener.sockets[0].getsockname()[1]
+            messages = await stand_in(*await asyncio.open_connection('127.0.0.1', port),
+                                      name=name, players=4)
+            listener.close()
+            return messages
+
+        messages = asyncio.run(run('3'))
+        self.assertEqual([m['type'] for m in messages], ['error'])
+        self.assertIn('taken', messages[0]['message'])
+        # Names of seats that aren't at the table are fine.
+        messages = asyncio.run(run('5'))
+        self.assertEqual(messages[0]['players'], ['5', '2', '3', '4'])
+        self.assertEqual(messages[-1]['type'], 'end')
+
+    def test_profiler(self):
+        async def run():
+            server = GoFishServer(rng=5, profiler=TurnProfiler())
+            listener = await server.start_tcp()
+            port = listener.sockets[0].getsockname()[1]
+            await stand_in(*await asyncio.open_connection('127.0.0.1', port))
+            listener.close()
+            return server
+
+        summary = asyncio.run(run()).profiler.summary()
+        self.assertIn('RemotePlayer', summary['ask'])
+        self.assertIn('confirm', summary)
+        self.assertIn('book', summary)
+
+    def test_same_phases_as_do_turn(self):
+        timings = []
+        for run in (lambda b_game: b_game.do_full_round(),
+                    lambda b_game: asyncio.run(play_table(b_game))):
+            profiler = TurnProfiler()
+            run(GoFishFactory.build_basic_game(player_count=4, rng=6, profiler=profiler))
+            timings.append({key: calls for key, (_, calls) in profiler.timings.items()})
+        self.assertEqual(timings[0], timings[1])
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix sockets are not supported.')
+    def test_unix_socket(self):
+        async def run(path):
+            server = GoFishServer(rng=3)
+            listener = await server.start_unix(path)
+            messages = await stand_in(*await asyncio.open_unix_connection(path))
+            listener.close()
+            return messages
+
+        with tempfile.TemporaryDirectory() as folder:
+            messages = asyncio.run(run(os.path.join(folder, 'fish.sock')))
+        self.assertEqual(messages[-1]['type'], 'end')
+
+
+if __name__ == '__main__':
+    unittest.main()
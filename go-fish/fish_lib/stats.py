@@ -0,0 +1,300 @@
+"""
+Statistics that are gathered one game at a time.
+
+Nothing here keeps the games around, so the memory used doesn't grow with the
+number of games. Accumulators from different workers can be merged together.
+"""
+from collections import Counter
+import math
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """
+    The Wilson score interval of a win rate.
+
+    Parameters:
+        successes:
+            The number of wins.
+        trials:
+            The number of tries.
+        z:
+            The z-score of the confidence level. 1.96 is 95%.
+
+    :return: A tuple of the low and high end of the interval.
+    """
+    if not trials:
+        return 0.0, 1.0
+    rate = successes / trials
+    z2 = z * z
+    center = (rate + z2 / (2 * trials)) / (1 + z2 / trials)
+    spread = z * math.sqrt(rate * (1 - rate) / trials + z2 / (4 * trials * trials))
+    spread /= 1 + z2 / trials
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+class RunningStat(object):
+    """
+    Keeps the count, mean and variance of a stream of numbers with Welford's method.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        """
+        Adds a single number to the stream.
+        :param value: The number to add.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """
+        Adds every number that other has seen as if they were added to this one.
+        :param other: Another RunningStat.
+        """
+        count = self.count + other.count
+        if not count:
+            return
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+
+    @property
+    def variance(self):
+        """
+        The sample variance of the numbers. 0 if there are less than 2 of them.
+        """
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std_error(self):
+        """
+        The standard error of the mean.
+        """
+        if not self.count:
+            return 0.0
+        return math.sqrt(self.variance / self.count)
+
+
+class RatioStat(object):
+    """
+    Keeps the ratio of two sums over a stream of groups, like wins over seats over many
+    games, with a standard error that treats every group as one sample. Results in the
+    same group can depend on each other, so they aren't counted as separate tries.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.trials = 0.0
+        self._total2 = 0.0
+        self._cross = 0.0
+        self._trials2 = 0.0
+
+    def add(self, value, trials):
+        """
+        Adds one group.
+        :param value: The sum of the group, like the number of seats that won.
+        :param trials: The size of the group, like the number of seats.
+        """
+        self.count += 1
+        self.total += value
+        self.trials += trials
+        self._total2 += value * value
+        self._cross += value * trials
+        self._trials2 += trials * trials
+
+    def merge(self, other):
+        """
+        Adds every group that other has seen.
+        :param other: Another RatioStat.
+        """
+        self.count += other.count
+        self.total += other.total
+        self.trials += other.trials
+        self._total2 += other._total2
+        self._cross += other._cross
+        self._trials2 += other._trials2
+
+    @property
+    def ratio(self):
+        """
+        The sum of the values over the sum of the trials.
+        """
+        return self.total / self.trials if self.trials else 0.0
+
+    @property
+    def std_error(self):
+        """
+        The cluster-robust standard error of the ratio. 0 if there are less than 2 groups.
+        """
+        if self.count < 2:
+            return 0.0
+        ratio = self.ratio
+        spread = self._total2 - 2 * ratio * self._cross + ratio * ratio * self._trials2
+        return math.sqrt(max(0.0, spread) * self.count / (self.count - 1)) / self.trials
+
+    def interval(self, z=1.96):
+        """
+        :param z: The z-score of the confidence level. 1.96 is 95%.
+        :return: A tuple of the low and high end of the normal interval of the ratio,
+                 kept within 0 and 1. (0, 1) if there are less than 2 groups.
+        """
+        if self.count < 2:
+            return 0.0, 1.0
+        spread = z * self.std_error
+        return max(0.0, self.ratio - spread), min(1.0, self.ratio + spread)
+
+
+class TournamentStats(object):
+    """
+    Keeps running statistics over the results of many games of Go Fish.
+
+    Every player's seat counts as a try for their type. A seat wins if it is one of
+    the game's winners and ties if it shares the win. A game that hit the turn limit
+    has no winners, so none of its seats win.
+
+    Seats of the same type in one game aren't independent tries, since they play the
+    same table and only a few of them can win. So the confidence intervals take every
+    game as one sample of each type in it, and use the cluster-robust variance of the
+    type's wins over its seats instead of a Wilson interval over the seats.
+
+    Properties:
+        games: The number of games added.
+        timeouts: The number of games that hit the turn limit.
+        turns: A RunningStat of the number of turns of every game.
+        seats: A Counter of player type: number of seats played.
+        wins: A Counter of player type: number of seats that won.
+        ties: A Counter of player type: number of seats that shared a win.
+        books: A dict of player type: RunningStat of the books of every seat.
+        shares: A dict of player type: RatioStat of the wins over the seats of every game.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.timeouts = 0
+        self.turns = RunningStat()
+        self.seats = Counter()
+        self.wins = Counter()
+        self.ties = Counter()
+        self.books = {}
+        self.shares = {}
+
+    def add_game(self, b_game):
+        """
+        Adds the results of a finished game.
+        :param b_game: A game.BasicGoFish that is done or hit the turn limit.
+        """
+        winners = b_game.winner
+        if winners is None:
+            self.timeouts += 1
+            winners = ()
+        tie = len(winners) > 1
+
+        self.games += 1
+        self.turns.add(b_game.turns)
+        game_seats = Counter()
+        game_wins = Counter()
+        for player in b_game.players:
+            player_type = type(player)
+            game_seats[player_type] += 1
+            if player_type not in self.books:
+                self.books[player_type] = RunningStat()
+            self.books[player_type].add(len(player.books))
+            if player in winners:
+                game_wins[player_type] += 1
+                if tie:
+                    self.ties[player_type] += 1
+
+        self.seats.update(game_seats)
+        self.wins.update(game_wins)
+        for player_type, seats in game_seats.items():
+            if player_type not in self.shares:
+                self.shares[player_type] = RatioStat()
+            self.shares[player_type].add(game_wins[player_type], seats)
+
+    def merge(self, other):
+        """
+        Adds every game that other has seen.
+        :param other: Another TournamentStats.
+        """
+        self.games += other.games
+        self.timeouts += other.timeouts
+        self.turns.merge(other.turns)
+        self.seats.update(other.seats)
+        self.wins.update(other.wins)
+        self.ties.update(other.ties)
+        for player_type, books in other.books.items():
+            self.books.setdefault(player_type, RunningStat()).merge(books)
+        for player_type, shares in other.shares.items():
+            self.shares.setdefault(player_type, RatioStat()).merge(shares)
+
+    @property
+    def timeout_rate(self):
+        """
+        The fraction of games that hit the turn limit.
+        """
+        return self.timeouts / self.games if self.games else 0.0
+
+    def win_rate(self, player_type):
+        """
+        :return: The fraction of seats of player_type that won.
+        """
+        return self.wins[player_type] / self.seats[player_type] if self.seats[player_type] else 0.0
+
+    def tie_rate(self, player_type):
+        """
+        :return: The fraction of seats of player_type that shared a win.
+        """
+        return self.ties[player_type] / self.seats[player_type] if self.seats[player_type] else 0.0
+
+    def interval(self, player_type, z=1.96):
+        """
+        :return: The interval of the win rate of player_type, with every game as one
+                 sample. See RatioStat.interval.
+        """
+        shares = self.shares.get(player_type)
+        return shares.interval(z) if shares is not None else (0.0, 1.0)
+
+    def precise(self, width, z=1.96):
+        """
+        Checks if every player type's win rate is known well enough.
+        :param width: The widest that any interval is allowed to be.
+        :param z: The z-score of the confidence level.
+        :return: True if there is a game and every interval is at most width wide.
+        """
+        if not self.games:
+            return False
+        for player_type in self.seats:
+            low, high = self.interval(player_type, z)
+            if high - low > width:
+                return False
+        return True
+
+    def summary(self, z=1.96):
+        """
+        :return: A list with a dict of statistics for every player type.
+        """
+        rows = []
+        for player_type in self.seats:
+            low, high = self.interval(player_type, z)
+            rows.append({'type': player_type.__name__,
+                         'seats': self.seats[player_type],
+                         'win_rate': self.win_rate(player_type),
+                         'win_low': low,
+                         'win_high': high,
+                         'tie_rate': self.tie_rate(player_type),
+                         'books_mean': self.books[player_type].mean,
+                         'books_var': self.books[player_type].variance,
+                         'turns_mean': self.turns.mean,
+                         'turns_var': self.turns.variance,
+                         'timeout_rate': self.timeout_rate})
+        return rows
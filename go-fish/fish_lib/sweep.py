@@ -0,0 +1,191 @@
+"""
+Sweeps a grid of Go Fish setups and writes the results as a table.
+
+A cell of the grid is a player count, a fixed seating of player classes and a
+StingyPlayer deny limit. Every cell plays its own games, seeded from the master
+seed and the cell's key, so a cell always gets the same results no matter what
+else is in the grid. Finished cells are appended to a cache file as they come in,
+and running a sweep again only plays the cells that aren't in the cache yet.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import json
+import os
+import random
+
+from .players import StingyPlayer
+from .rules import STANDARD, Rules
+from .stats import TournamentStats
+from .tournament import CHUNK_SIZE, game_seeds, stats_chunk
+
+# seats is a tuple of player classes in turn order. deny_limit is None for cells
+# without a StingyPlayer, where it makes no difference.
+Cell = namedtuple('Cell', ['player_count', 'seats', 'deny_limit'])
+
+COLUMNS = ('player_count', 'seats', 'deny_limit', 'games', 'seed', 'type', 'type_seats',
+           'win_rate', 'win_low', 'win_high', 'tie_rate', 'books_mean', 'books_var',
+           'turns_mean', 'turns_var')
+
+
+def grid(player_counts=range(2, 11), mixes=((StingyPlayer,),), deny_limits=(2,)):
+    """
+    Builds every cell of a grid.
+
+    A mix is a sequence of player classes for the first seats, and its last class fills
+    the rest of the table. So (StingyPlayer, TryingPlayer) seats one StingyPlayer and
+    then only TryingPlayers. Cells that seat more of a class than its LIMIT are left
+    out, and so are repeats.
+
+    Parameters:
+        player_counts:
+            The player counts to sweep.
+        mixes:
+            The seat mixes to sweep.
+        deny_limits:
+            The StingyPlayer deny limits to sweep.
+
+    :return: A list of Cell.
+    """
+    cells = []
+    for player_count in player_counts:
+        for mix in mixes:
+            seats = tuple(mix[min(i, len(mix) - 1)] for i in range(player_count))
+            if any(seats.count(cls) > cls.LIMIT for cls in seats):
+                continue
+            limits = deny_limits if StingyPlayer in seats else (None,)
+            for deny_limit in limits:
+                cell = Cell(player_count, seats, deny_limit)
+                if cell not in cells:
+                    cells.append(cell)
+    return cells
+
+
+def seat_names(cell):
+    """
+    :return: The class names of a cell's seats joined by dashes, like TryingPlayer-DumbPlayer.
+    """
+    return '-'.join(cls.__name__ for cls in cell.seats)
+
+
+def cell_key(cell, game_count, seed):
+    """
+    :return: A string that names a cell played with game_count games and a master seed.
+    """
+    return '{}|{}|{}|{}|{}'.format(cell.player_count, seat_names(cell), cell.deny_limit,
+                                   game_count, seed)
+
+
+def cell_rows(cell, game_count, seed, stats):
+    """
+    Turns the statistics of a cell in to rows of the table, one for every player type.
+    :return: A list of dicts with every key in COLUMNS.
+    """
+    rows = []
+    for row in stats.summary():
+        rows.append({'player_count': cell.player_count,
+                     'seats': seat_names(cell),
+                     'deny_limit': '' if cell.deny_limit is None else cell.deny_limit,
+                     'games': game_count,
+                     'seed': seed,
+                     'type': row['type'],
+                     'type_seats': row['seats'],
+                     'win_rate': row['win_rate'],
+                     'win_low': row['win_low'],
+                     'win_high': row['win_high'],
+                     'tie_rate': row['tie_rate'],
+                     'books_mean': row['books_mean'],
+                     'books_var': row['books_var'],
+                     'turns_mean': row['turns_mean'],
+                     'turns_var': row['turns_var']})
+    return rows
+
+
+def load_cache(path):
+    """
+    Reads the rows of every cell in a cache file.
+    :param path: The path of the cache file. It doesn't have to exist.
+    :return: A dict of cell key: list of rows.
+    """
+    cache = {}
+    if path is None or not os.path.exists(path):
+        return cache
+    with open(path) as stream:
+        for line in stream:
+            if line.strip():
+                entry = json.loads(line)
+                cache[entry['key']] = entry['rows']
+    return cache
+
+
+def run_sweep(cells, game_count=2000, seed=0, workers=None, cache_path=None, csv_path=None):
+    """
+    Plays game_count games for every cell that isn't cached yet, spread over a pool
+    of worker processes.
+
+    Keyword Parameters:
+        game_count: int
+            The number of games to play for every cell.
+        seed: int
+            The master seed. Every cell's games are seeded from it and the cell's key.
+        workers: int
+            The number of worker processes. If None, uses every core.
+            If 1, the games are played in this process.
+        cache_path: str
+            A JSON lines file of finished cells. Cells found in it aren't played again
+            and new cells are appended to it as they finish. If None, nothing is cached.
+        csv_path: str
+            If given, the table is written to this CSV file.
+
+    :return: A list of rows, with every key in COLUMNS, in the order of cells.
+    """
+    cache = load_cache(cache_path)
+    todo = {}
+    for cell in cells:
+        key = cell_key(cell, game_count, seed)
+        if key not in cache and key not in todo:
+            todo[key] = cell
+
+    if todo:
+        pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+        try:
+            jobs = {}
+            for key, cell in todo.items():
+                rules = STANDARD if cell.deny_limit is None else Rules(deny_limit=cell.deny_limit)
+                seeds = game_seeds(random.Random(key).getrandbits(64), game_count)
+                chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, game_count, CHUNK_SIZE)]
+                if pool is None:
+                    jobs[key] = [stats_chunk(chunk, cell.player_count, cell.seats, rules)
+                                 for chunk in chunks]
+                else:
+                    jobs[key] = [pool.submit(stats_chunk, chunk, cell.player_count, cell.seats,
+                                             rules) for chunk in chunks]
+
+            for key, results in jobs.items():
+                stats = TournamentStats()
+                for result in results:
+                    stats.merge(result if pool is None else result.result())
+                cache[key] = cell_rows(todo[key], game_count, seed, stats)
+                if cache_path is not None:
+                    with open(cache_path, 'a') as stream:
+                        stream.write(json.dumps({'key': key, 'rows': cache[key]}) + '\n')
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    rows = [row for cell in cells for row in cache[cell_key(cell, game_count, seed)]]
+    if csv_path is not None:
+        write_csv(rows, csv_path)
+    return rows
+
+
+def write_csv(rows, path):
+    """
+    Writes rows of a sweep to a CSV file with a header of COLUMNS.
+    :param rows: A list of dicts from run_sweep.
+    :param path: The path of the CSV file.
+    """
+    with open(path, 'w', newline='') as stream:
+        writer = csv.DictWriter(stream, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
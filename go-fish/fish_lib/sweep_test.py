@@ -0,0 +1,50 @@
+from . import sweep
+from .players import DumbPlayer, StingyPlayer, TryingPlayer
+from .sweep import COLUMNS, grid, load_cache, run_sweep
+
+import csv
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class SweepTestCase(unittest.TestCase):
+    def test_grid(self):
+        cells = grid(player_counts=(2, 3), mixes=((StingyPlayer, DumbPlayer), (StingyPlayer,)),
+                     deny_limits=(0, 2))
+        # A table of only StingyPlayers breaks its LIMIT.
+        self.assertEqual(len(cells), 4)
+        self.assertEqual(cells[2].seats, (StingyPlayer, DumbPlayer, DumbPlayer))
+
+        cells = grid(player_counts=(4,), mixes=((TryingPlayer,),), deny_limits=(0, 2))
+        self.assertEqual([cell.deny_limit for cell in cells], [None])
+
+    def test_cached_sweep(self):
+        cells = grid(player_counts=(2, 4), mixes=((StingyPlayer, TryingPlayer),),
+                     deny_limits=(0, 3))
+        with tempfile.TemporaryDirectory() as folder:
+            cache_path = os.path.join(folder, 'sweep.jsonl')
+            csv_path = os.path.join(folder, 'sweep.csv')
+            rows = run_sweep(cells[:2], game_count=40, seed=1, workers=1,
+                             cache_path=cache_path)
+            self.assertEqual(len(load_cache(cache_path)), 2)
+
+            # Only the new cells are played the second time around.
+            with mock.patch.object(sweep, 'stats_chunk', wraps=sweep.stats_chunk) as chunk:
+                all_rows = run_sweep(cells, game_count=40, seed=1, workers=1,
+                                     cache_path=cache_path, csv_path=csv_path)
+                self.assertEqual(chunk.call_count, 2)
+            self.assertEqual(all_rows[:len(rows)], rows)
+
+            with open(csv_path, newline='') as stream:
+                table = list(csv.DictReader(stream))
+            self.assertEqual(tuple(table[0]), COLUMNS)
+            self.assertEqual(len(table), 2 * len(cells))
+            self.assertEqual({row['seats'] for row in table}, {'StingyPlayer-TryingPlayer',
+                                                               'StingyPlayer-TryingPlayer-'
+                                                               'TryingPlayer-TryingPlayer'})
+
+
+if __name__ == '__main__':
+    unittest.main()
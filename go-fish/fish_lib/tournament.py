@@ -0,0 +1,287 @@
+"""
+Runs large batches of Go Fish games across worker processes.
+
+Every game gets its own seed drawn from a master seed, and the games are split
+into fixed size chunks. The chunks don't depend on how many workers there are,
+so a master seed always gives the same win counts. Any single game can be
+played again with play_game and its seed.
+"""
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import islice, repeat
+import os
+import random
+import time
+
+try:
+    import resource
+except ImportError:  # Not on Unix.
+    resource = None
+
+from .factory import GamePool, GoFishFactory
+from .gamelog import BinaryLogObserver
+from .stats import TournamentStats
+
+CHUNK_SIZE = 250
+
+# The result of run_streaming. peak_rss and worker_peak_rss are in kilobytes, and are
+# None where the resource module is missing.
+StreamReport = namedtuple('StreamReport', ['stats', 'seconds', 'peak_rss', 'worker_peak_rss'])
+
+
+def game_seeds(seed, game_count):
+    """
+    Derives one seed per game from the master seed.
+    :param seed: The master seed of the tournament.
+    :param game_count: The number of seeds to create.
+    :return: A list of ints, one for every game.
+    """
+    master = random.Random(seed)
+    return [master.getrandbits(64) for _ in range(game_count)]
+
+
+def iter_seeds(seed):
+    """
+    Endlessly derives game seeds from the master seed, the same way game_seeds does.
+    :param seed: The master seed of the tournament.
+    :return: A generator of ints.
+    """
+    master = random.Random(seed)
+    while True:
+        yield master.getrandbits(64)
+
+
+def play_game(seed, player_count=6, observer=None, seat_types=None, rules=None):
+    """
+    Plays one game from its seed. The same seed always plays the same game.
+    :param seed: The seed of the game, see game_seeds.
+    :param player_count: The number of players in the game.
+    :param observer: A observers.GameObserver for the game. If None, the game is silent.
+    :param seat_types: The class of every seat for a fixed seating. If None, the seats
+                       are picked at random like in GoFishFactory.build_basic_game.
+    :param rules: The rules.Rules of the game. If None, uses rules.STANDARD.
+    :return: The finished game.BasicGoFish.
+    """
+    b_game = GoFishFactory.build_basic_game(player_count=player_count, rng=seed,
+                                            observer=observer, seat_types=seat_types,
+                                            rules=rules)
+    b_game.do_full_round()
+    return b_game
+
+
+def play_chunk(seeds, player_count, log_path=None):
+    """
+    Plays one silent game for every seed given.
+
+    This is the function that runs inside of the worker processes.
+
+    Parameters:
+        seeds:
+            The seeds of the games to play.
+        player_count:
+            The number of players in every game.
+        log_path:
+            If given, the games are logged with gamelog.BinaryLogObserver and the
+            whole chunk is appended to this file at once.
+
+    :return: A Counter of player type: number of wins. Games that hit the turn limit
+             have no winners.
+    """
+    observer = None
+    if log_path is not None:
+        log = BytesIO()
+        observer = BinaryLogObserver(log)
+
+    win_count = Counter()
+    for seed in seeds:
+        b_game = play_game(seed, player_count, observer)
+        for win in b_game.winner or ():
+            win_count[type(win)] += 1
+
+    if log_path is not None:
+        with open(log_path, 'ab') as stream:
+            stream.write(log.getvalue())
+    return win_count
+
+
+def run_tournament(game_count=10000, player_count=6, seed=None, workers=None, log_path=None):
+    """
+    Plays game_count games of Go Fish spread over a pool of worker processes.
+
+    Keyword Parameters:
+        game_count: int
+            The number of games to play.
+        player_count: int
+            The number of players in every game.
+        seed: int
+            The master seed. If None, a random one is picked.
+        workers: int
+            The number of worker processes. If None, uses every core.
+            If 1, the games are played in this process.
+        log_path: str
+            If given, every game is appended to this file as a binary log.
+            See gamelog. The chunks are written in the order they finish.
+
+    :return: A Counter of player type: number of wins.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    seeds = game_seeds(seed, game_count)
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, game_count, CHUNK_SIZE)]
+
+    win_count = Counter()
+    if workers == 1:
+        for chunk in chunks:
+            win_count.update(play_chunk(chunk, player_count, log_path))
+        return win_count
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_count in pool.map(play_chunk, chunks, repeat(player_count),
+                                    repeat(log_path)):
+            win_count.update(chunk_count)
+    return win_count
+
+
+def stats_chunk(seeds, player_count, seat_types=None, rules=None):
+    """
+    Plays one silent game for every seed given and gathers their statistics.
+    See play_chunk and play_game for the parameters.
+    :return: A stats.TournamentStats of the games.
+    """
+    stats = TournamentStats()
+    for seed in seeds:
+        stats.add_game(play_game(seed, player_count, seat_types=seat_types, rules=rules))
+    return stats
+
+
+def run_until_precise(width=0.02, player_count=6, seed=None, workers=None, z=1.96,
+                      max_games=1000000):
+    """
+    Plays games until every player type's win rate is known well enough.
+
+    The games are played a chunk at a time and the statistics are checked after every
+    chunk, in order. So a master seed always stops after the same number of games, no
+    matter how many workers there are.
+
+    Keyword Parameters:
+        width: float
+            The widest that any win rate's confidence interval can be before stopping.
+        player_count: int
+            The number of players in every game.
+        seed: int
+            The master seed. If None, a random one is picked.
+        workers: int
+            The number of worker processes. If None, uses every core.
+            If 1, the games are played in this process.
+        z: float
+            The z-score of the confidence level. 1.96 is 95%.
+        max_games: int
+            Stops after this many games even if the intervals are still too wide.
+
+    :return: A stats.TournamentStats of every game played.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    seeds = iter_seeds(seed)
+    wave_size = workers or os.cpu_count() or 1
+    stats = TournamentStats()
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        while stats.games < max_games:
+            chunks = []
+            for _ in range(wave_size):
+                size = min(CHUNK_SIZE, max_games - stats.games - CHUNK_SIZE * len(chunks))
+                if size <= 0:
+                    break
+                chunks.append([next(seeds) for _ in range(size)])
+
+            if pool is None:
+                results = (stats_chunk(chunk, player_count) for chunk in chunks)
+            else:
+                results = pool.map(stats_chunk, chunks, repeat(player_count))
+
+            for chunk_stats in results:
+                stats.merge(chunk_stats)
+                if stats.precise(width, z):
+                    return stats
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return stats
+
+
+def peak_rss():
+    """
+    Gets the most memory that this process and its finished workers have held at once.
+    :return: A tuple of kilobytes for this process and for its largest worker, or a tuple
+             of None where the resource module is missing.
+    """
+    if resource is None:
+        return None, None
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def stream_chunk(seeds, player_count):
+    """
+    Plays one silent game for every seed given on a single factory.GamePool and gathers
+    their statistics. Nothing but the statistics outlives a game.
+    See play_chunk for the parameters.
+    :return: A stats.TournamentStats of the games.
+    """
+    pool = GamePool(player_count)
+    stats = TournamentStats()
+    for seed in seeds:
+        stats.add_game(pool.play(seed))
+    return stats
+
+
+def run_streaming(game_count=10000, player_count=6, seed=None, workers=None):
+    """
+    Plays game_count games with memory that stays flat no matter how many there are.
+
+    The seeds are made as they are needed, every worker reuses one game and its players
+    for all of its games, and the results are folded in to one stats.TournamentStats.
+    Only a few chunks per worker are in flight at once. The games and their order are
+    the same as run_tournament's for the same master seed.
+
+    Keyword Parameters:
+        game_count: int
+            The number of games to play.
+        player_count: int
+            The number of players in every game.
+        seed: int
+            The master seed. If None, a random one is picked.
+        workers: int
+            The number of worker processes. If None, uses every core.
+            If 1, the games are played in this process.
+
+    :return: A StreamReport.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    start = time.perf_counter()
+    seeds = islice(iter_seeds(seed), game_count)
+    chunks = iter(lambda: list(islice(seeds, CHUNK_SIZE)), [])
+    stats = TournamentStats()
+
+    if workers == 1:
+        for chunk in chunks:
+            stats.merge(stream_chunk(chunk, player_count))
+    else:
+        in_flight = 2 * (workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(stream_chunk, chunk, player_count))
+                if len(pending) >= in_flight:
+                    stats.merge(pending.popleft().result())
+            while pending:
+                stats.merge(pending.popleft().result())
+
+    return StreamReport(stats, time.perf_counter() - start, *peak_rss())
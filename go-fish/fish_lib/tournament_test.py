@@ -0,0 +1,170 @@
+from .cards import encode
+from .factory import GamePool, GoFishFactory
+from .gamelog import BinaryLogObserver, replay, replay_file
+from .rules import Rules
+from .stats import RatioStat, RunningStat, TournamentStats, wilson_interval
+from .tournament import (play_chunk, play_game, run_streaming, run_tournament,
+                         run_until_precise, stats_chunk)
+
+from io import BytesIO
+import math
+import os
+import statistics
+import tempfile
+import unittest
+
+
+class TournamentTestCase(unittest.TestCase):
+    def test_same_seed_same_results(self):
+        serial = run_tournament(game_count=300, seed=42, workers=1)
+        pooled = run_tournament(game_count=300, seed=42, workers=2)
+        self.assertEqual(serial, pooled)
+
+    def test_every_game_has_a_winner(self):
+        win_count = run_tournament(game_count=100, player_count=4, seed=7, workers=1)
+        self.assertGreaterEqual(sum(win_count.values()), 100)
+
+    def test_replay_game(self):
+        first = play_game(1234)
+        again = play_game(1234)
+        self.assertEqual([p.books for p in first.players], [p.books for p in again.players])
+        self.assertEqual([type(p) for p in first.players], [type(p) for p in again.players])
+
+    def test_run_until_precise(self):
+        serial = run_until_precise(width=0.1, seed=5, workers=1)
+        pooled = run_until_precise(width=0.1, seed=5, workers=2)
+        self.assertEqual(serial.games, pooled.games)
+        self.assertEqual(serial.wins, pooled.wins)
+        self.assertTrue(serial.precise(0.1))
+        self.assertFalse(run_until_precise(width=0.01, seed=5, workers=1,
+                                           max_games=300).precise(0.01))
+
+    def test_game_pool(self):
+        pool = GamePool(5)
+        for seed in range(30):
+            pooled = pool.play(seed)
+            built = play_game(seed, 5)
+            self.assertEqual([(type(p), p.books) for p in pooled.players],
+                             [(type(p), p.books) for p in built.players])
+            self.assertEqual(pooled.turns, built.turns)
+
+    def test_run_streaming(self):
+        report = run_streaming(game_count=600, seed=42, workers=2)
+        self.assertEqual(report.stats.games, 600)
+        self.assertEqual(report.stats.wins, run_tournament(game_count=600, seed=42, workers=1))
+        self.assertGreater(report.peak_rss, 0)
+
+
+class GameLogTestCase(unittest.TestCase):
+    def test_replay_matches_game(self):
+        log = BytesIO()
+        observer = BinaryLogObserver(log)
+        b_games = [play_game(seed, 4, observer) for seed in range(20)]
+
+        replayed = list(replay(log.getvalue()))
+        self.assertEqual(len(replayed), len(b_games))
+        for b_game, r_game in zip(b_games, replayed):
+            self.assertEqual(r_game.turns, b_game.turns)
+            self.assertEqual(r_game.books, tuple(tuple(encode((book, 'Spades')) >> 2
+                                                       for book in p.books)
+                                                 for p in b_game.players))
+            self.assertEqual(r_game.winners, tuple(b_game.players.index(p)
+                                                   for p in b_game.winner))
+            self.assertEqual(r_game.hands, ((),) * 4)
+
+    def test_replay_rule_variants(self):
+        log = BytesIO()
+        b_game = GoFishFactory.build_basic_game(player_count=3, rng=4, compact=True,
+                                                observer=BinaryLogObserver(log),
+                                                rules=Rules(decks=2, book_size=3))
+        b_game.do_full_round()
+
+        r_game, = replay(log.getvalue())
+        self.assertEqual(r_game.books, tuple(tuple(p.books) for p in b_game.players))
+        self.assertEqual(r_game.hands, tuple(tuple(sorted(p.hand)) for p in b_game.players))
+
+    def test_log_path(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'games.bin')
+            play_chunk(list(range(10)), 6, path)
+            play_chunk(list(range(10, 15)), 6, path)
+            self.assertEqual(len(list(replay_file(path))), 15)
+
+
+class StatsTestCase(unittest.TestCase):
+    def test_running_stat(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        first, second = RunningStat(), RunningStat()
+        for value in values[:3]:
+            first.add(value)
+        for value in values[3:]:
+            second.add(value)
+        first.merge(second)
+        self.assertEqual(first.count, len(values))
+        self.assertAlmostEqual(first.mean, statistics.mean(values))
+        self.assertAlmostEqual(first.variance, statistics.variance(values))
+
+    def test_wilson_interval(self):
+        low, high = wilson_interval(50, 100)
+        self.assertLess(low, 0.5)
+        self.assertGreater(high, 0.5)
+        self.assertAlmostEqual(high - 0.5, 0.5 - low)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+
+    def test_ratio_stat(self):
+        groups = [(1, 3), (0, 2), (2, 3), (0, 1), (1, 3)]
+        first, second = RatioStat(), RatioStat()
+        for value, trials in groups[:2]:
+            first.add(value, trials)
+        for value, trials in groups[2:]:
+            second.add(value, trials)
+        first.merge(second)
+
+        ratio = 4 / 12
+        spread = sum((value - ratio * trials) ** 2 for value, trials in groups)
+        self.assertEqual(first.count, 5)
+        self.assertAlmostEqual(first.ratio, ratio)
+        self.assertAlmostEqual(first.std_error, math.sqrt(spread * 5 / 4) / 12)
+        low, high = first.interval()
+        self.assertAlmostEqual(high - first.ratio, first.ratio - low)
+        self.assertEqual(RatioStat().interval(), (0.0, 1.0))
+
+    def test_interval_counts_games(self):
+        # Every game has three seats of one type. When they win or lose together the
+        # game is worth one try, not three, and when only one of them can win the wins
+        # are steadier than three separate tries.
+        wilson_low, wilson_high = wilson_interval(450, 900)
+        together, apart = RatioStat(), RatioStat()
+        for game in range(300):
+            together.add(3 * (game % 2), 3)
+            apart.add(1 + game % 2, 3)
+        low, high = together.interval()
+        self.assertGreater(high - low, wilson_high - wilson_low)
+        low, high = apart.interval()
+        self.assertLess(high - low, wilson_high - wilson_low)
+
+        stats = run_until_precise(width=0.1, seed=5, workers=1)
+        for player_type in stats.seats:
+            self.assertEqual(stats.shares[player_type].total, stats.wins[player_type])
+            self.assertEqual(stats.shares[player_type].trials, stats.seats[player_type])
+
+    def test_turn_limit(self):
+        stats = stats_chunk(list(range(10)), 4, rules=Rules(turn_limit=5))
+        self.assertEqual(stats.games, 10)
+        self.assertEqual(stats.timeouts, 10)
+        self.assertEqual(stats.timeout_rate, 1.0)
+        self.assertEqual(sum(stats.wins.values()), 0)
+        self.assertEqual(stats.turns.mean, 5)
+        for row in stats.summary():
+            self.assertEqual(row['win_rate'], 0.0)
+            self.assertEqual(row['timeout_rate'], 1.0)
+
+        merged = TournamentStats()
+        merged.merge(stats)
+        merged.merge(stats_chunk(list(range(10)), 4))
+        self.assertEqual(merged.games, 20)
+        self.assertEqual(merged.timeouts, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,22 +4,105 @@ The executable test script for fish_lib.
 Author: Justin Smith
 Date: 1/23/18
 """
+import asyncio
 import sys
 
 from fish_lib.factory import GoFishFactory as factory
+from fish_lib.observers import PrintObserver
+from fish_lib.players import DumbPlayer, StingyPlayer, TryingPlayer
+from fish_lib.profiling import TurnProfiler
+from fish_lib.server import GoFishServer
+from fish_lib.sweep import grid, run_sweep
+from fish_lib.tournament import run_streaming, run_tournament
 
 
-def stat_run():
-    win_count = {}
-    for i in range(10000):
-        g = factory.build_basic_game(player_count=6)
-        g.do_full_round()
-        for win in g.winner:
-            win_count[type(win)] = win_count.get(type(win), 0) + 1
+def stat_run(game_count=10000, seed=None, workers=None):
+    """
+    Plays game_count silent games spread across worker processes and prints
+    the number of wins for every player type.
+    :return: A Counter of player type: number of wins.
+    """
+    win_count = run_tournament(game_count=game_count, player_count=6, seed=seed,
+                               workers=workers)
+
+    for k in win_count:
+        print(k, win_count[k])
+    return win_count
+
+
+def stream_run(game_count=1000000, seed=None, workers=None):
+    """
+    Plays game_count games with flat memory and prints the win rate of every player
+    type, the speed and the peak memory.
+    :return: A fish_lib.tournament.StreamReport.
+    """
+    report = run_streaming(game_count=game_count, player_count=6, seed=seed, workers=workers)
+
+    for row in report.stats.summary():
+        print(row['type'], row['win_rate'])
+    print('{} games in {:.1f}s, peak RSS {} KB, largest worker {} KB'.format(
+        report.stats.games, report.seconds, report.peak_rss, report.worker_peak_rss))
+    return report
+
+
+def batch_run(game_count=10000, seed=None):
+    """
+    Plays game_count games at once with fish_lib.batch and prints the number of wins
+    for every player type. Needs NumPy.
+    :return: A dict of player type: number of wins.
+    """
+    from fish_lib.batch import BatchGoFish
+
+    win_count = BatchGoFish(game_count, player_count=6, seed=seed).run().win_counts()
 
     for k in win_count:
         print(k, win_count[k])
-                
+    return win_count
+
+
+def sweep_run(game_count=2000, seed=0, workers=None):
+    """
+    Sweeps every player count with a few seat mixes and deny limits, and writes the
+    table to sweep.csv. Finished cells are cached in sweep.jsonl, so running it again
+    only plays what is new.
+    :return: The rows of the table.
+    """
+    cells = grid(player_counts=range(2, 11),
+                 mixes=((StingyPlayer, TryingPlayer), (StingyPlayer, DumbPlayer),
+                        (TryingPlayer, DumbPlayer)),
+                 deny_limits=(0, 1, 2, 3))
+    rows = run_sweep(cells, game_count=game_count, seed=seed, workers=workers,
+                     cache_path='sweep.jsonl', csv_path='sweep.csv')
+    print('Wrote {} rows for {} cells to sweep.csv'.format(len(rows), len(cells)))
+    return rows
+
+
+def phase_run(game_count=1000):
+    """
+    Plays game_count silent games with a shared TurnProfiler and prints its summary
+    as JSON.
+    :return: The TurnProfiler.
+    """
+    profiler = TurnProfiler()
+    for i in range(game_count):
+        factory.run_silent_game(player_count=6, profiler=profiler)
+
+    print(profiler.to_json(indent=2))
+    return profiler
+
+
+def serve_run(host='127.0.0.1', port=8765):
+    """
+    Hosts Go Fish tables over TCP until the process is stopped. Every connection
+    gets its own table, see fish_lib.server for the messages.
+    """
+    async def serve():
+        listener = await GoFishServer().start_tcp(host, port)
+        print('Serving Go Fish on {}:{}'.format(host, port))
+        async with listener:
+            await listener.serve_forever()
+
+    asyncio.run(serve())
 
 
 def main():
@@ -29,7 +112,7 @@ def main():
     """
     line_sep_char = '#'
     
-    fish = factory.build_basic_game(player_count=6)
+    fish = factory.build_basic_game(player_count=6, observer=PrintObserver())
 
     print(('{0:%s^30}' % line_sep_char).format('Players'))
     for i in fish.players:
@@ -67,6 +150,16 @@ if __name__ == '__main__':
     # Used if the script is used in an interactive environment
     if '-p' in sys.argv:
         prof_main()
+    elif '-b' in sys.argv:
+        batch_run()
+    elif '-t' in sys.argv:
+        phase_run()
+    elif '-s' in sys.argv:
+        sweep_run()
+    elif '-m' in sys.argv:
+        stream_run()
+    elif '-S' in sys.argv:
+        serve_run()
     else:
         #main()
         stat_run()
@@ -0,0 +1,309 @@
+"""
+Plays thousands of games of War in lockstep with NumPy arrays.
+
+Every game is a row in a set of arrays. Each player's deck is a fixed-width ring
+of card ranks with a head cursor and a count, so playing cards and adding cards
+never moves the rest of the deck. Suits never decide anything, so cards are only
+tracked by rank, and a win pile is only shuffled before it goes back in to a deck,
+so win piles and pots are kept as counts of every rank.
+
+A step plays one turn of every unfinished game at once: the top cards are compared
+across the whole batch, and only the games that tied go on to play wars. The rules
+are the same as main.Game's, and both shuffle uniformly, so the two play games
+of the same length and seat odds.
+
+This module needs NumPy, which main does not.
+
+Run it from the war folder:
+
+    python batch.py --games 1000000 --players 2 --decks 1
+"""
+import argparse
+from collections import Counter
+import time
+
+import numpy as np
+
+from main import WIN_ORDER
+from tournament import WarReport
+
+RANK_COUNT = len(WIN_ORDER)  # Rank 0 is the empty play of a player that lost.
+WAR_CARDS = 4
+
+
+class BatchWar(object):
+    """
+    Runs game_count games of War with the same number of players and decks.
+
+    The state arrays only have rows for the games that are still being played, and a
+    few that just finished. The rows of finished games are dropped once they make up
+    an eighth of the rows, so later steps don't spend much time on them.
+
+    Properties:
+        ids: (row,) array of the game number of every row.
+        deck: (row, player, card) ring of the ranks in every player's deck.
+        head: (row, player) array of where the top of every deck is.
+        size: (row, player) array of how many cards are in every deck.
+        pile: (row, player, rank) array of how many cards of a rank every win pile has.
+        pile_size: (row, player) array of how many cards are in every win pile.
+        pot: (row, rank) array of how many cards of a rank are in every pot.
+        last: (row, player) array of the rank of the last card every player put in the pot.
+        lost: (row, player) array of which players have lost.
+        turns: (game,) array of how many turns every game took.
+        wars: (game,) array of how many wars broke out in every game.
+        winner: (game,) array of the player that won every game, or -1 if it timed out.
+        done: (game,) array of which games are over.
+    """
+
+    STATE = ('ids', 'deck', 'head', 'size', 'pile', 'pile_size', 'pot', 'last', 'lost',
+             '_turns', '_wars')
+
+    def __init__(self, game_count, player_count=2, deck_count=1, seed=None):
+        """
+        Parameters:
+            game_count:
+                The number of games to play at once.
+            player_count:
+                The number of players in every game.
+            deck_count:
+                The number of decks in every game.
+            seed:
+                The seed of the numpy.random.Generator.
+        """
+        card_count = 52 * deck_count
+        if card_count % player_count != 0:
+            raise ValueError('Unable to split cards evenly between players!')
+        hand_size = card_count // player_count
+
+        self.rng = np.random.default_rng(seed)
+        self.game_count = game_count
+        self.player_count = player_count
+        self.card_count = card_count
+        self.turn_limit = 1000 * deck_count
+
+        # Shuffles every deck at once by sorting random keys.
+        shuffled = self.rng.random((game_count, card_count)).argsort(axis=1)
+        ranks = (shuffled // (4 * deck_count) + 1).astype(np.int8)
+
+        self.ids = np.arange(game_count)
+        self.deck = np.zeros((game_count, player_count, card_count), dtype=np.int8)
+        self.deck[:, :, :hand_size] = ranks.reshape(game_count, player_count, hand_size)
+        self.head = np.zeros((game_count, player_count), dtype=np.int64)
+        self.size = np.full((game_count, player_count), hand_size, dtype=np.int64)
+        self.pile = np.zeros((game_count, player_count, RANK_COUNT), dtype=np.int64)
+        self.pile_size = np.zeros((game_count, player_count), dtype=np.int64)
+        self.pot = np.zeros((game_count, RANK_COUNT), dtype=np.int64)
+        self.last = np.zeros((game_count, player_count), dtype=np.int8)
+        self.lost = np.zeros((game_count, player_count), dtype=bool)
+        self._turns = np.zeros(game_count, dtype=np.int64)
+        self._wars = np.zeros(game_count, dtype=np.int64)
+
+        self.turns = np.zeros(game_count, dtype=np.int64)
+        self.wars = np.zeros(game_count, dtype=np.int64)
+        self.winner = np.full(game_count, -1, dtype=np.int64)
+        self.done = np.zeros(game_count, dtype=bool)
+
+        self._seats = np.arange(player_count)
+        self._flatten()
+
+    def _flatten(self):
+        """
+        Makes the flat views of the state, indexed by row * player_count + player.
+        """
+        self._deck = self.deck.reshape(-1, self.card_count)
+        self._head = self.head.reshape(-1)
+        self._size = self.size.reshape(-1)
+        self._pile = self.pile.reshape(-1, RANK_COUNT)
+        self._pile_size = self.pile_size.reshape(-1)
+        self._last = self.last.reshape(-1)
+        self._pot = self.pot.reshape(-1)
+
+    def _keep(self, rows):
+        """
+        Drops every row of the state that rows is False for.
+        """
+        for name in self.STATE:
+            setattr(self, name, getattr(self, name)[rows])
+        self._flatten()
+
+    def _play(self, seats, count):
+        """
+        Plays up to count cards from the top of every seat's deck in to its game's pot.
+        :return: A bool array that is True for the seats that played a card.
+        """
+        sizes = self._size[seats]
+        taken = np.minimum(sizes, count)
+        steps = np.arange(count)
+        cards = self._deck[seats[:, None], (self._head[seats, None] + steps) % self.card_count]
+        played = steps < taken[:, None]
+
+        rows = seats // self.player_count
+        np.add.at(self._pot, (rows[:, None] * RANK_COUNT + cards)[played], 1)
+
+        moved = taken > 0
+        self._last[seats[moved]] = cards[moved, taken[moved] - 1]
+        self._head[seats] = (self._head[seats] + taken) % self.card_count
+        self._size[seats] = sizes - taken
+        return moved
+
+    def _refill(self, seats, desired):
+        """
+        Shuffles the win pile of every seat with less than desired cards in its deck, and
+        adds it to the bottom of the deck.
+        :param seats: The flat indices of the seats to check. If None, checks every seat.
+        """
+        size, pile_size = self._size, self._pile_size
+        if seats is None:
+            seats = np.flatnonzero((size < desired) & (pile_size > 0))
+        else:
+            seats = seats[(size[seats] < desired) & (pile_size[seats] > 0)]
+        if not seats.size:
+            return
+        pile_sizes = pile_size[seats]
+
+        # Lays every pile out in rank order, one after another, then shuffles the cards of
+        # every pile by sorting random keys that are offset by the pile's row.
+        rows = np.repeat(np.arange(len(seats)), pile_sizes)
+        cards = np.repeat(np.tile(np.arange(RANK_COUNT, dtype=np.int8), len(seats)),
+                          self._pile[seats].reshape(-1))
+        cards = cards[(rows + self.rng.random(len(rows))).argsort()]
+
+        starts = np.repeat(pile_sizes.cumsum() - pile_sizes, pile_sizes)
+        spots = (np.arange(len(rows)) - starts + self._head[seats][rows]
+                 + size[seats][rows]) % self.card_count
+        self._deck[seats[rows], spots] = cards
+        size[seats] += pile_sizes
+        self._pile[seats] = 0
+        pile_size[seats] = 0
+
+    def step(self):
+        """
+        Plays one turn of every unfinished game.
+        :return: True if any game was still going.
+        """
+        row_count = len(self.ids)
+        if not row_count:
+            return False
+        p_count = self.player_count
+
+        # Every player that hasn't lost plays their top card.
+        lost = self.lost
+        self.last[lost] = 0
+        self._play(np.flatnonzero(~lost), 1)
+
+        values = self.last
+        tied = values == values.max(axis=1, keepdims=True)
+        winners = tied.argmax(axis=1)
+
+        # Wars, only for the games that tied.
+        at_war = np.flatnonzero(tied.sum(axis=1) > 1)
+        party = tied[at_war]
+        while at_war.size:
+            self._wars[at_war] += 1
+            self._refill((at_war[:, None] * p_count + self._seats).reshape(-1), WAR_CARDS)
+
+            rows, players = np.nonzero(party)
+            moved = self._play(at_war[rows] * p_count + players, WAR_CARDS)
+            played = np.bincount(rows[moved], minlength=len(at_war)) > 0
+
+            values = np.where(party, self.last[at_war], -1)
+            party &= values == values.max(axis=1, keepdims=True)
+            # The tie stands if nobody had a card left to play, and the first player wins.
+            settled = (party.sum(axis=1) == 1) | ~played
+            winners[at_war[settled]] = party[settled].argmax(axis=1)
+            at_war, party = at_war[~settled], party[~settled]
+
+        # The winner takes the pot in to their win pile.
+        winners += np.arange(row_count) * p_count
+        self._pile[winners] += self.pot
+        self._pile_size[winners] += self.pot.sum(axis=1)
+        self.pot.fill(0)
+
+        self._refill(None, 1)
+        np.equal(self.size, 0, out=lost)
+        self._turns += 1
+
+        standing = ~lost
+        over = standing.sum(axis=1) == 1
+        finished = over | (self._turns >= self.turn_limit)
+        fresh = finished & ~self.done[self.ids]
+        if fresh.any():
+            ids = self.ids[fresh]
+            self.turns[ids] = self._turns[fresh]
+            self.wars[ids] = self._wars[fresh]
+            won = fresh & over
+            self.winner[self.ids[won]] = standing[won].argmax(axis=1)
+            self.done[ids] = True
+
+        # Finished games keep being played until enough of them have piled up to be
+        # worth dropping, but nothing about them is recorded any more.
+        gone = np.count_nonzero(finished)
+        if gone and gone * 8 >= row_count:
+            self._keep(~finished)
+        return True
+
+    def run(self):
+        """
+        Steps every game until all of them are done.
+        :return: self
+        """
+        while self.step():
+            pass
+        return self
+
+    def report(self):
+        """
+        :return: A tournament.WarReport of every game.
+        """
+        report = WarReport()
+        report.games = self.game_count
+        report.timeouts = int((self.winner < 0).sum())
+        report.wins = Counter({int(player): int(count) for player, count
+                               in enumerate(np.bincount(self.winner[self.winner >= 0],
+                                                        minlength=self.player_count))
+                               if count})
+        for counts, values in ((report.turns, self.turns), (report.wars, self.wars)):
+            for value, count in zip(*np.unique(values, return_counts=True)):
+                counts[int(value)] = int(count)
+        return report
+
+
+def run_batches(game_count=100000, player_count=2, deck_count=1, seed=None, batch_size=50000):
+    """
+    Plays game_count games in batches of at most batch_size.
+    :return: A tournament.WarReport of every game.
+    """
+    seeds = np.random.SeedSequence(seed).spawn((game_count + batch_size - 1) // batch_size)
+    report = WarReport()
+    for i, batch_seed in enumerate(seeds):
+        count = min(batch_size, game_count - i * batch_size)
+        report.merge(BatchWar(count, player_count, deck_count, batch_seed).run().report())
+    return report
+
+
+def main(argv=None):
+    """
+    Plays batches of games from the command line and prints their report.
+    """
+    parser = argparse.ArgumentParser(description='Plays many games of War with NumPy.')
+    parser.add_argument('--games', type=int, default=100000, help='The number of games.')
+    parser.add_argument('--players', type=int, default=2, help='The players in every game.')
+    parser.add_argument('--decks', type=int, default=1, help='The decks in every game.')
+    parser.add_argument('--seed', type=int, default=None, help='The seed.')
+    parser.add_argument('--batch', type=int, default=50000,
+                        help='The most games that are played at once.')
+    parser.add_argument('--bin', type=int, default=50,
+                        help='The width of the bins of the turn histogram.')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    report = run_batches(args.games, args.players, args.decks, args.seed, args.batch)
+    elapsed = time.perf_counter() - start
+    print(report.format(args.bin))
+    turns = sum(value * count for value, count in report.turns.items())
+    print('Played in {:.2f} seconds ({:.0f} games/s, {:.0f} turns/s).'.format(
+        elapsed, report.games / elapsed, turns / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from batch import BatchWar
+from tournament import WarReport
+import main
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class BatchWarTestCase(unittest.TestCase):
+    def test_cards_are_kept(self):
+        batch = BatchWar(500, player_count=4, deck_count=2, seed=1)
+        while batch.step():
+            cards = batch.size.sum(axis=1) + batch.pile_size.sum(axis=1) + batch.pot.sum(axis=1)
+            self.assertTrue((cards == batch.card_count).all())
+            self.assertTrue((batch.pile.sum(axis=2) == batch.pile_size).all())
+        self.assertTrue(batch.done.all())
+
+    def test_recorded_once(self):
+        batch = BatchWar(500, seed=2)
+        recorded = {}
+        while batch.step():
+            for game in numpy.flatnonzero(batch.done):
+                result = (batch.turns[game], batch.wars[game], batch.winner[game])
+                self.assertEqual(recorded.setdefault(game, result), result)
+        self.assertEqual(len(recorded), 500)
+        self.assertTrue((batch.turns > 0).all())
+        self.assertTrue(((batch.winner >= 0) | (batch.turns == batch.turn_limit)).all())
+
+    def test_matches_game(self):
+        batch = BatchWar(5000, seed=3).run().report()
+
+        games = WarReport()
+        rng = random.Random()
+        for seed in range(1500):
+            rng.seed(seed)
+            game = main.Game(compact=True, rng=rng)
+            games.add_game(game, game.play_game())
+
+        self.assertAlmostEqual(batch.mean(batch.turns), games.mean(games.turns), delta=25)
+        self.assertAlmostEqual(batch.mean(batch.wars), games.mean(games.wars), delta=1.5)
+        self.assertAlmostEqual(batch.timeout_rate, games.timeout_rate, delta=0.015)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,42 +1,182 @@
 """
 This module allows the computer to play War with itself.
+
+Games are played silently unless they are given an observer. A game with no
+observer skips all of the calls, so nothing is formatted or printed. PrintObserver
+prints every event like the game used to.
+
 Author: Justin Smith
 """
 
+from collections import deque
 import itertools
-
-from random import randint
+import random
 
 WIN_ORDER = (None, 2, 3, 4, 5, 6, 7, 8, 9, 10, 'Jack', 'Queen', 'King', 'Ace')
 SUITS = ('Spades', 'Clubs', 'Hearts', 'Diamond')
 
 BASE_DECK = tuple(itertools.product(WIN_ORDER[1:], SUITS))
 
+# Compact cards are ints: the card's index in WIN_ORDER * 4 + the suit's index.
+# The value of a card is then card >> 2, and 0 stands for an empty play.
+COMPACT_DECK = bytes(value << 2 | suit for value in range(1, len(WIN_ORDER))
+                     for suit in range(len(SUITS)))
+
+# What a player that lost puts in the pot. Compact games use 0 instead.
+EMPTY_CARD = (None,)
+
+# The winning value of every card, tuple and compact alike, and of the empty plays.
+CARD_VALUES = {card: WIN_ORDER.index(card[0]) for card in BASE_DECK}
+CARD_VALUES.update((card, card >> 2) for card in COMPACT_DECK)
+# Compact games play 0 for a player that lost. No compact card is 0, since they start
+# at 1 << 2, so the empty play can't be mistaken for a card.
+CARD_VALUES[EMPTY_CARD] = CARD_VALUES[0] = 0
+
+
+def card_to_tuple(card):
+    """
+    Turns a compact card back in to a (value, suit) tuple for printing.
+    Card tuples are returned as is.
 
-def shuffle(a_list: list, times: int = 1):
+    :param card: A compact int card or a card tuple.
+    :return: A tuple containing value and suit.
+    """
+    if isinstance(card, int):
+        return WIN_ORDER[card >> 2], SUITS[card & 3]
+    return card
+
+
+def shuffle(a_list: list, times: int = 1, rng=None):
     """
     Scrambles a list's elements.
 
-    This method actually makes n moves. (n = amount of elements in the a_list)
+    Every order is equally likely. Moving random elements to the end n times
+    (n = amount of elements in the a_list), like this used to, favors some orders
+    and dealt the first player the low cards.
 
     :param a_list: The list to scramble.
     :param times: The amount of times to scramble.
+    :param rng: The random.Random to scramble with. If None, uses the random module.
     :return: Returns the supplied list.
     """
-    length = len(a_list)
+    scramble = (rng or random).shuffle
     for i in range(times):
-        for j in range(length):
-            a_list.append(a_list.pop(randint(0, length - 1)))
+        scramble(a_list)
     return a_list
 
 
+class WarObserver(object):
+    """
+    This class shows the events that a game of War reports. Every method does nothing,
+    so subclasses only have to replace the ones they care about.
+    """
+
+    def on_start(self, game):
+        """
+        Called once the cards have been dealt.
+        :param game: The Game that is starting.
+        """
+        pass
+
+    def on_play(self, player_index: int, card):
+        """
+        Called when a player plays the top card of their deck.
+        :param player_index: The index of the player.
+        :param card: The card that was played.
+        """
+        pass
+
+    def on_no_play(self, player_index: int):
+        """
+        Called when a player that lost has nothing to play.
+        :param player_index: The index of the player.
+        """
+        pass
+
+    def on_deck_check(self, player_index: int, count: int):
+        """
+        Called when a player's deck is counted, before it is refilled.
+        :param player_index: The index of the player.
+        :param count: The number of cards in their deck.
+        """
+        pass
+
+    def on_refill(self, player_index: int, count: int):
+        """
+        Called when a player adds their win pile to their deck.
+        :param player_index: The index of the player.
+        :param count: The number of cards that were added.
+        """
+        pass
+
+    def on_war(self, war_count: int, winner: int):
+        """
+        Called when a turn was won through one or more wars.
+        :param war_count: The number of wars that were needed.
+        :param winner: The index of the player that won the pot.
+        """
+        pass
+
+    def on_turn_won(self, winner: int):
+        """
+        Called when a turn was won without a war.
+        :param winner: The index of the player that won the pot.
+        """
+        pass
+
+    def on_end(self, game, winner):
+        """
+        Called when play_game is done.
+        :param game: The Game that ended.
+        :param winner: The index of the player that won, or None if the game timed out.
+        """
+        pass
+
+
+class PrintObserver(WarObserver):
+    """
+    Prints every event as a human-readable line.
+    """
+
+    def on_start(self, game):
+        print('Each player has {} cards in their decks.'.format(len(game.players[0].deck)))
+
+    def on_play(self, player_index, card):
+        print('Player {} played a {} of {}.'.format(player_index + 1, *card_to_tuple(card)))
+
+    def on_no_play(self, player_index):
+        print('Player {} couldn\'t play anything!'.format(player_index + 1))
+
+    def on_deck_check(self, player_index, count):
+        print('Player {} has {} cards in their deck.'.format(player_index + 1, count))
+
+    def on_refill(self, player_index, count):
+        print('Player {} added {} cards in to their deck.'.format(player_index + 1, count))
+
+    def on_war(self, war_count, winner):
+        print('A war broke out ({} time(s)) and Player {} was the victor!'.format(war_count,
+                                                                                  winner + 1))
+
+    def on_turn_won(self, winner):
+        print('Player {} has won this turn without contest!'.format(winner + 1))
+
+    def on_end(self, game, winner):
+        if winner is None:
+            print('The game timed out!')
+        else:
+            print('After {} turns, Player {} has won the game!'.format(game.turns, winner + 1))
+
+
 class Player:
     """
     A modal class for holding player data.
     Properties:
-        deck: A list of tuples that contain value and suit.
+        deck: A deque of the cards the player will play, front first. Cards
+              are tuples that contain value and suit, or compact ints.
         lost: A boolean that says if the player has lost their game.
         win_pile: A list of "cards" that has been won by the player.
+        rng: The random.Random that shuffles the win_pile, or None for the
+             random module.
         total_cards: An int of how many cards are in the player's
                      win_pile and deck.
 
@@ -51,10 +191,11 @@ class Player:
 
     """
 
-    def __init__(self, deck: list):
-        self.deck = deck
+    def __init__(self, deck, rng=None):
+        self.deck = deque(deck)
         self.lost = False
         self.win_pile = []
+        self.rng = rng
 
     def add_win_to_deck(self, shuf: bool = True):
         """
@@ -66,7 +207,7 @@ class Player:
         :return: Nothing
         """
         if shuf:
-            shuffle(self.win_pile)
+            shuffle(self.win_pile, rng=self.rng)
         self.deck.extend(self.win_pile)
         self.win_pile.clear()
 
@@ -80,9 +221,8 @@ class Player:
         :param cards: The number of cards to get.
         :return: A list of cards that the player will use.
         """
-        result = self.deck[:cards or 1]
-        self.deck = self.deck[cards or 1:]
-        return result
+        deck = self.deck
+        return [deck.popleft() for _ in range(min(cards or 1, len(deck)))]
 
     @property
     def total_cards(self):
@@ -102,6 +242,12 @@ class Game:
         deck: The deck that is used throughout the game. Immutable.
         players: Every player that is in this game. Called in many methods.
         pot: Every players' card contribution for the round.
+        observer: A WarObserver that is told about every event, or None to play silently.
+        turns: The number of turns that play_game has played.
+        wars: The number of wars that have broken out.
+        rng: The random.Random that shuffles every deck and win pile. The game can
+             be given a seed for it instead, and the same seed always plays the
+             same game.
 
     Methods:
         award_pot: Awards every players' pot to a single player.
@@ -118,19 +264,32 @@ class Game:
 
     """
 
-    def __init__(self, player_count: int = 2, deck_count: int = 1):
+    def __init__(self, player_count: int = 2, deck_count: int = 1, compact: bool = False,
+                 observer: WarObserver = None, rng=None):
+        self.rng = rng = rng if isinstance(rng, random.Random) else random.Random(rng)
         if (52 * deck_count) % player_count != 0:
             raise ValueError('Unable to split cards evenly between players!')
         cards = (52 * deck_count) // player_count
-        self.deck = tuple(shuffle(list(BASE_DECK * deck_count)))
+        if compact:
+            # The deck is bytes of compact cards. See COMPACT_DECK.
+            self.deck = bytes(shuffle(list(COMPACT_DECK * deck_count), rng=rng))
+            self.empty_card = 0
+        else:
+            self.deck = tuple(shuffle(list(BASE_DECK * deck_count), rng=rng))
+            self.empty_card = EMPTY_CARD
         self.players = []
         self.pot = tuple(([] for i in range(player_count)))
+        self._pot_values = [0] * player_count
+        self.observer = observer
+        self.turns = 0
+        self.wars = 0
 
-        print('Each player has {} cards in their decks.'.format(cards))
         for i in range(player_count):
             start = i * cards
             end = (i + 1) * cards
-            self.players.append(Player(list(self.deck[start:end])))
+            self.players.append(Player(self.deck[start:end], rng=rng))
+        if observer is not None:
+            observer.on_start(self)
 
     def award_pot(self, player_index: int):
         """
@@ -139,7 +298,8 @@ class Game:
         :return: Nothing.
         """
         for i, winnings in enumerate(self.pot):
-            self.players[player_index].win_pile.extend((x for x in winnings if x[0] is not None))
+            self.players[player_index].win_pile.extend((x for x in winnings
+                                                        if x != self.empty_card))
             self.pot[i].clear()
 
     def check_players_decks(self, desired_count: int = None):
@@ -149,10 +309,14 @@ class Game:
         :param desired_count: The desired amount of cards of every player.
         :return: Nothing
         """
+        observer = self.observer
+        desired_count = desired_count or 4
         for i, player in enumerate(self.players):
-            print('Player {} has {} cards in their deck.'.format(i + 1, len(player.deck)))
-            if len(player.deck) < (desired_count or 4):
-                print('Player {} added {} cards in to their deck.'.format(i + 1, len(player.deck)))
+            if observer is not None:
+                observer.on_deck_check(i, len(player.deck))
+            if len(player.deck) < desired_count:
+                if observer is not None:
+                    observer.on_refill(i, len(player.win_pile))
                 player.add_win_to_deck(shuf=True)
 
     def count_player_cards(self):
@@ -166,10 +330,10 @@ class Game:
     def get_card_value(card):
         """
         A helper method for getting the priority of the card.
-        :param card: A tuple containing value and suit.
+        :param card: A tuple containing value and suit or a compact int card.
         :return: The int that dedicates the winning power.
         """
-        return WIN_ORDER.index(card[0])
+        return CARD_VALUES[card]
 
     def get_pot_value(self, players: list = None):
         """
@@ -177,49 +341,57 @@ class Game:
         :param players: A list of indices of players' pot. If None: defaults to all the players.
         :return: A list of the pot's values.
         """
+        pot = self.pot
         if players:
-            pot_value = []
-            for player in players:
-                pot_value.append(self.get_card_value(self.pot[player][-1]))
-            return pot_value
-
-        return list(map(self.get_card_value, (player_pot[-1] for player_pot in self.pot)))
+            return [CARD_VALUES[pot[player][-1]] for player in players]
+        return [CARD_VALUES[player_pot[-1]] for player_pot in pot]
 
     # Game Methods
 
     def war(self, players: list):
         """
         This method is called in order to break a tie between players.
+        If none of the players have a card left to play, the tie can't be broken and
+        the first of them wins.
+
         :param players: The indices of the players involved
         :return: The index of the player that won; if another tie occurred, returns -1
         """
         self.check_players_decks()
 
+        played = False
         for player in players:
             played_cards = self.players[player].play(cards=4)
+            played = played or bool(played_cards)
             self.pot[player].extend(played_cards)
 
         pot_value = self.get_pot_value(players)
         best_card = max(pot_value)
-        if pot_value.count(best_card) > 1:
+        if played and pot_value.count(best_card) > 1:
             return -1
-        return pot_value.index(best_card)
+        return players[pot_value.index(best_card)]
 
     def step(self):
         """
         Runs one turn of the War Game.
         :return: Nothing
         """
+        observer = self.observer
+        # The values are written in to the same list every turn, as the cards are played.
+        pot_values = self._pot_values
         for index, player in enumerate(self.players):
             if not player.lost:
-                active_card = player.play(cards=1)[0]
-                print('Player {} played a {} of {}.'.format(index + 1, *active_card))
-                self.pot[index].append(active_card)
+                # Players that haven't lost always have a card left.
+                active_card = player.deck.popleft()
+                if observer is not None:
+                    observer.on_play(index, active_card)
             else:
-                print('Player {} couldn\'t play anything!'.format(index + 1))
-                self.pot[index].append([None])
+                active_card = self.empty_card
+                if observer is not None:
+                    observer.on_no_play(index)
+            self.pot[index].append(active_card)
+            pot_values[index] = CARD_VALUES[active_card]
 
-        pot_values = self.get_pot_value()
         best_card = max(pot_values)
 
         if pot_values.count(best_card) > 1:
@@ -237,22 +409,22 @@ class Game:
                 pot_values = self.get_pot_value(war_party)
                 best_card = max(pot_values)
 
-                # Builds and adds the participants of the war.
-                war_party = []
-                for i, val in enumerate(pot_values):
-                    if val == best_card:
-                        war_party.append(i)
+                # Keeps the participants of the war that tied again.
+                war_party = [war_party[i] for i, val in enumerate(pot_values)
+                             if val == best_card]
 
                 war_result = self.war(war_party)
 
                 war_count += 1
 
-            print('A war broke out ({} time(s)) and Player {} was the victor!'.format(war_count,
-                                                                                      war_result + 1))
+            self.wars += war_count
+            if observer is not None:
+                observer.on_war(war_count, war_result)
             self.award_pot(war_result)
         else:
             winner = pot_values.index(best_card)
-            print('Player {} has won this turn without contest!'.format(winner + 1))
+            if observer is not None:
+                observer.on_turn_won(winner)
             self.award_pot(winner)
 
         self.check_players_decks(desired_count=1)
@@ -263,23 +435,25 @@ class Game:
     def play_game(self):
         """
         Plays the game until a winner is declared or 1000 turns for every deck have passed.
-        :return: Nothing
+        The number of turns played is kept in turns.
+        :return: The index of the player that won, or None if the game timed out.
         """
-        iterations = 0
+        turn_limit = 1000 * len(self.deck) // 52
         active_players = [player for player in self.players if not player.lost]
-        while len(active_players) != 1 and iterations < (1000 * len(self.deck) / 52):
+        while len(active_players) != 1 and self.turns < turn_limit:
             # Active code sections
             self.step()
 
             # Increment sections
             active_players = [player for player in self.players if not player.lost]
-            iterations += 1
+            self.turns += 1
 
-        if iterations >= 1000:
-            print('The game timed out!')
-            return
-        print('After {} turns, Player {} has won the game!'.format(iterations + 1,
-                                                                   self.players.index(active_players[0]) + 1))
+        winner = None
+        if len(active_players) == 1:
+            winner = self.players.index(active_players[0])
+        if self.observer is not None:
+            self.observer.on_end(self, winner)
+        return winner
 
 
 class GameFactory:
@@ -290,26 +464,34 @@ class GameFactory:
     Properties:
         player_count: the int supplied to Game's constructor for player_count
         deck_count: the int supplied to Game's constructor for deck_count
+        compact: the bool supplied to Game's constructor for compact
 
     Methods:
         create_game:
             Returns a new instance of Game with the supplied arguments.
     """
 
-    def __init__(self, player_count: int = None, deck_count: int = None):
+    def __init__(self, player_count: int = None, deck_count: int = None, compact: bool = False):
         self.player_count = player_count or 2
         self.deck_count = deck_count or 1
+        self.compact = compact
 
-    def create_game(self, player_count=None, deck_count=None):
+    def create_game(self, player_count=None, deck_count=None, compact=None, observer=None,
+                    rng=None):
         """
         Quickly builds a new instance of Game with supplied arguments.
 
         :param player_count: Overrides the class' parameter
         :param deck_count: Overrides the class' parameter
+        :param compact: Overrides the class' parameter
+        :param observer: The WarObserver of the game. If None, the game is silent.
+        :param rng: A random.Random or a seed for the game.
         :return: A new instance of Game pre-configured.
         """
         return Game(player_count=player_count or self.player_count,
-                    deck_count=deck_count or self.deck_count)
+                    deck_count=deck_count or self.deck_count,
+                    compact=self.compact if compact is None else compact,
+                    observer=observer, rng=rng)
 
 
 def quick_test():
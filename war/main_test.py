@@ -0,0 +1,213 @@
+from collections import deque
+import contextlib
+import io
+import random
+import unittest
+from unittest import mock
+
+import main
+
+
+def cards(*values):
+    """
+    :return: A list of card tuples with the given values. Suits don't matter to War.
+    """
+    return [(value, 'Spades') for value in values]
+
+
+class ListDeck(list):
+    """
+    A deck that is a plain list, like players had before decks were deques.
+    """
+
+    def popleft(self):
+        return self.pop(0)
+
+
+class ListPlayer(main.Player):
+    """
+    A Player that plays from a list by slicing, like it used to.
+    """
+
+    def __init__(self, deck, rng=None):
+        super().__init__(deck, rng=rng)
+        self.deck = ListDeck(deck)
+
+    def play(self, cards: int = None):
+        result = self.deck[:cards or 1]
+        del self.deck[:cards or 1]
+        return result
+
+
+class CardValuesTestCase(unittest.TestCase):
+    def test_tuple_cards(self):
+        for card in main.BASE_DECK:
+            self.assertEqual(main.CARD_VALUES[card], main.WIN_ORDER.index(card[0]))
+
+    def test_compact_cards(self):
+        for card in main.COMPACT_DECK:
+            value, suit = main.card_to_tuple(card)
+            self.assertEqual(main.CARD_VALUES[card], main.WIN_ORDER.index(value))
+            self.assertIn(suit, main.SUITS)
+        self.assertNotIn(0, main.COMPACT_DECK)
+
+    def test_empty_plays(self):
+        self.assertEqual(main.CARD_VALUES[main.EMPTY_CARD], 0)
+        self.assertEqual(main.CARD_VALUES[0], 0)
+        self.assertEqual(len(main.CARD_VALUES), 2 * len(main.BASE_DECK) + 2)
+
+
+class RecordingObserver(main.WarObserver):
+    """
+    Keeps every event in a list.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.game = None
+
+    def on_start(self, game):
+        self.game = game
+        self.events.append(('start',))
+
+    def on_play(self, player_index, card):
+        self.events.append(('play', player_index))
+
+    def on_no_play(self, player_index):
+        self.events.append(('no_play', player_index))
+
+    def on_refill(self, player_index, count):
+        # Reported before the win pile is moved.
+        self.events.append(('refill', player_index, count,
+                            len(self.game.players[player_index].win_pile)))
+
+    def on_war(self, war_count, winner):
+        self.events.append(('war', war_count, winner))
+
+    def on_turn_won(self, winner):
+        self.events.append(('won', winner))
+
+    def on_end(self, game, winner):
+        self.events.append(('end', winner))
+
+
+class PlayerTestCase(unittest.TestCase):
+    def test_play(self):
+        player = main.Player(cards(2, 3, 4))
+        self.assertEqual(player.play(), cards(2))
+        self.assertEqual(player.play(cards=4), cards(3, 4))
+        self.assertEqual(player.play(cards=4), [])
+        self.assertEqual(player.total_cards, 0)
+
+    def test_add_win_to_deck(self):
+        player = main.Player(cards(2), rng=random.Random(1))
+        player.win_pile.extend(cards(5, 6, 7))
+        self.assertEqual(player.total_cards, 4)
+        player.add_win_to_deck()
+        self.assertEqual(player.win_pile, [])
+        self.assertEqual(player.play(), cards(2))
+        self.assertEqual(sorted(player.play(cards=3), key=str), cards(5, 6, 7))
+
+    def test_same_as_list_decks(self):
+        for seed in range(20):
+            game = main.Game(player_count=4, rng=seed)
+            with mock.patch.object(main, 'Player', ListPlayer):
+                listed = main.Game(player_count=4, rng=seed)
+            self.assertIsInstance(listed.players[0].deck, ListDeck)
+            self.assertEqual(game.play_game(), listed.play_game())
+            self.assertEqual((game.turns, game.wars), (listed.turns, listed.wars))
+
+
+class ObserverTestCase(unittest.TestCase):
+    def test_silent(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for seed in range(5):
+                main.Game(player_count=4, rng=seed).play_game()
+        self.assertEqual(output.getvalue(), '')
+
+    def test_print_observer(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            game = main.Game(rng=1, observer=main.PrintObserver())
+            winner = game.play_game()
+        self.assertTrue(output.getvalue().startswith('Each player has 26 cards'))
+        self.assertIn('Player {} has won the game!'.format(winner + 1), output.getvalue())
+
+    def test_event_order(self):
+        observer = RecordingObserver()
+        game = main.Game(player_count=4, rng=2, observer=observer)
+        winner = game.play_game()
+        events = observer.events
+
+        self.assertEqual(events[0], ('start',))
+        self.assertEqual(events[-1], ('end', winner))
+        self.assertIsNotNone(winner)
+        self.assertFalse(game.players[winner].lost)
+
+        # Every turn is everyone playing a card, or nothing if they lost, and then one
+        # result.
+        results = [i for i, event in enumerate(events) if event[0] in ('won', 'war')]
+        self.assertEqual(len(results), game.turns)
+        self.assertEqual(sum(event[1] for event in events if event[0] == 'war'), game.wars)
+        start = 0
+        for result in results:
+            plays = [event for event in events[start:result] if event[0] in ('play', 'no_play')]
+            self.assertEqual([event[1] for event in plays[:4]], [0, 1, 2, 3])
+            start = result + 1
+
+        refills = [event for event in events if event[0] == 'refill']
+        self.assertTrue(refills)
+        for _, _, count, pile in refills:
+            self.assertEqual(count, pile)
+
+    def test_timeout(self):
+        observer = RecordingObserver()
+        game = main.Game(observer=observer, rng=3)
+        game.turns = 1000
+        self.assertIsNone(game.play_game())
+        self.assertEqual(observer.events[-1], ('end', None))
+
+
+class GameTestCase(unittest.TestCase):
+    def deal(self, *decks):
+        """
+        Builds a game and replaces the players' decks with the given ones.
+        """
+        game = main.Game(player_count=len(decks), rng=0)
+        for player, deck in zip(game.players, decks):
+            player.deck = deque(cards(*deck))
+        return game
+
+    def test_multi_way_war(self):
+        # Players 2, 3 and 4 tie on Kings, 3 and 4 tie again on Queens, and 4 wins.
+        filler = (2,) * 4
+        game = self.deal((2,) + filler,
+                         ('King', 4, 4, 4, 3) + filler,
+                         ('King', 4, 4, 4, 'Queen', 4, 4, 4, 5) + filler,
+                         ('King', 4, 4, 4, 'Queen', 4, 4, 4, 9) + filler)
+        game.step()
+        self.assertEqual([len(player.win_pile) for player in game.players], [0, 0, 0, 24])
+        self.assertEqual(game.wars, 2)
+
+    def test_war_player_runs_out(self):
+        # Player 1 has nothing to play in the war, so their King still counts.
+        game = self.deal(('King',), ('King', 5, 5, 5, 2, 5))
+        game.step()
+        # Their deck ran dry, so the pot they won went straight in to it.
+        self.assertEqual(len(game.players[0].deck), 6)
+        self.assertEqual(len(game.players[1].deck), 1)
+        self.assertEqual(game.wars, 1)
+
+    def test_war_without_cards(self):
+        # Nobody can break the tie, so the first player takes the pot.
+        game = self.deal(('King',), ('King',))
+        game.step()
+        self.assertEqual(len(game.players[0].win_pile), 0)
+        self.assertEqual(len(game.players[0].deck), 2)
+        self.assertTrue(game.players[1].lost)
+        self.assertEqual(game.play_game(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Plays large batches of War games across worker processes and reports how long
+they ran.
+
+Every game gets its own seed drawn from a master seed, and the games are split
+into fixed size chunks. Each worker keeps one random.Random and reseeds it for
+every game, so a master seed always gives the same report no matter how many
+workers there are. The decks are dealt with main.shuffle, which picks every
+order equally, so every seat should win about as often as the others.
+
+The game comes from main, which is imported as a top-level module, so this only
+works from the war folder, or with it on sys.path. Run it from there:
+
+    python tournament.py --games 100000 --players 2 --decks 1
+"""
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import random
+import time
+
+from main import Game
+
+CHUNK_SIZE = 500
+
+
+def game_seeds(seed, game_count):
+    """
+    Derives one seed per game from the master seed.
+    :param seed: The master seed of the tournament.
+    :param game_count: The number of seeds to create.
+    :return: A list of ints, one for every game.
+    """
+    master = random.Random(seed)
+    return [master.getrandbits(64) for _ in range(game_count)]
+
+
+class WarReport:
+    """
+    Counts how a batch of games went. Reports from different workers can be merged.
+
+    Properties:
+        games: The number of games played.
+        timeouts: The number of games that hit the turn limit.
+        wins: A Counter of player index: games won.
+        turns: A Counter of turn count: games that lasted that long.
+        wars: A Counter of war count: games that had that many wars.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.timeouts = 0
+        self.wins = Counter()
+        self.turns = Counter()
+        self.wars = Counter()
+
+    def add_game(self, game, winner):
+        """
+        Counts a finished game.
+        :param game: The main.Game that was played.
+        :param winner: What game.play_game returned.
+        """
+        self.games += 1
+        if winner is None:
+            self.timeouts += 1
+        else:
+            self.wins[winner] += 1
+        self.turns[game.turns] += 1
+        self.wars[game.wars] += 1
+
+    def merge(self, other):
+        """
+        Adds the counts of another report to this one.
+        :param other: A WarReport.
+        :return: This report.
+        """
+        self.games += other.games
+        self.timeouts += other.timeouts
+        self.wins.update(other.wins)
+        self.turns.update(other.turns)
+        self.wars.update(other.wars)
+        return self
+
+    @property
+    def timeout_rate(self):
+        """
+        The fraction of games that timed out.
+        """
+        return self.timeouts / self.games if self.games else 0.0
+
+    @staticmethod
+    def mean(counts):
+        """
+        :param counts: A Counter of value: occurrences.
+        :return: The mean of the values.
+        """
+        total = sum(counts.values())
+        return sum(value * count for value, count in counts.items()) / total if total else 0.0
+
+    @staticmethod
+    def percentile(counts, fraction):
+        """
+        :param counts: A Counter of value: occurrences.
+        :param fraction: The fraction from 0 to 1 of the values that are at or below the result.
+        :return: The nearest-rank percentile of the values, or 0 if there are none.
+        """
+        rank = int(fraction * sum(counts.values()))
+        seen = 0
+        value = 0
+        for value in sorted(counts):
+            seen += counts[value]
+            if seen > rank:
+                break
+        return value
+
+    @staticmethod
+    def histogram(counts, bin_width=50):
+        """
+        Groups values in to bins of the same width.
+        :param counts: A Counter of value: occurrences.
+        :param bin_width: The width of every bin.
+        :return: A list of (bin start, occurrences) for every bin from the lowest value to
+                 the highest.
+        """
+        if not counts:
+            return []
+        bins = Counter()
+        for value, count in counts.items():
+            bins[value // bin_width] += count
+        return [(i * bin_width, bins[i]) for i in range(min(bins), max(bins) + 1)]
+
+    def format(self, bin_width=50):
+        """
+        :param bin_width: The width of the bins of the turn histogram.
+        :return: The report as human-readable lines.
+        """
+        lines = ['{} games, {} timed out ({:.2%})'.format(self.games, self.timeouts,
+                                                         self.timeout_rate)]
+        for name, counts in (('Turns', self.turns), ('Wars', self.wars)):
+            lines.append('{:<6} mean {:.1f}  p50 {}  p90 {}  p99 {}  max {}'.format(
+                name, self.mean(counts), self.percentile(counts, 0.5),
+                self.percentile(counts, 0.9), self.percentile(counts, 0.99),
+                max(counts, default=0)))
+        for player, count in sorted(self.wins.items()):
+            lines.append('Player {} won {} games.'.format(player + 1, count))
+
+        lines.append('Turns:')
+        histogram = self.histogram(self.turns, bin_width)
+        most = max((count for _, count in histogram), default=0)
+        for start, count in histogram:
+            bar = '#' * (count * 50 // most) if most else ''
+            lines.append('{:>7} {:>8} {}'.format(start, count, bar))
+        return '\n'.join(lines)
+
+
+def play_chunk(seeds, player_count, deck_count, compact=True):
+    """
+    Plays one silent game for every seed given.
+
+    This is the function that runs inside of the worker processes.
+
+    :return: A WarReport of the games.
+    """
+    report = WarReport()
+    rng = random.Random()
+    for seed in seeds:
+        rng.seed(seed)
+        game = Game(player_count, deck_count, compact=compact, rng=rng)
+        report.add_game(game, game.play_game())
+    return report
+
+
+def run_tournament(game_count=10000, player_count=2, deck_count=1, seed=None, workers=None,
+                   compact=True):
+    """
+    Plays game_count games of War spread over a pool of worker processes.
+
+    Keyword Parameters:
+        game_count: int
+            The number of games to play.
+        player_count: int
+            The number of players in every game.
+        deck_count: int
+            The number of decks in every game.
+        seed: int
+            The master seed. If None, a random one is picked.
+        workers: int
+            The number of worker processes. If None, uses every core.
+            If 1, the games are played in this process.
+        compact: bool
+            If the games are played with compact int cards.
+
+    :return: A WarReport of every game.
+    """
+    if (52 * deck_count) % player_count != 0:
+        raise ValueError('Unable to split cards evenly between players!')
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    seeds = game_seeds(seed, game_count)
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, game_count, CHUNK_SIZE)]
+
+    report = WarReport()
+    if workers == 1:
+        for chunk in chunks:
+            report.merge(play_chunk(chunk, player_count, deck_count, compact))
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_report in pool.map(play_chunk, chunks, repeat(player_count),
+                                     repeat(deck_count), repeat(compact)):
+            report.merge(chunk_report)
+    return report
+
+
+def main(argv=None):
+    """
+    Runs a tournament from the command line and prints its report.
+    """
+    parser = argparse.ArgumentParser(description='Plays many games of War.')
+    parser.add_argument('--games', type=int, default=10000, help='The number of games.')
+    parser.add_argument('--players', type=int, default=2, help='The players in every game.')
+    parser.add_argument('--decks', type=int, default=1, help='The decks in every game.')
+    parser.add_argument('--seed', type=int, default=None, help='The master seed.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='The number of worker processes. Every core if left out.')
+    parser.add_argument('--bin', type=int, default=50,
+                        help='The width of the bins of the turn histogram.')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    report = run_tournament(args.games, args.players, args.decks, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    print(report.format(args.bin))
+    print('Played in {:.2f} seconds ({:.0f} games/s).'.format(elapsed, report.games / elapsed))
+
+
+if __name__ == '__main__':
+    main()
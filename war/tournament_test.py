@@ -0,0 +1,24 @@
+import unittest
+
+from tournament import WarReport, run_tournament
+
+
+class TournamentTestCase(unittest.TestCase):
+    def test_workers(self):
+        one = run_tournament(1200, seed=4, workers=1)
+        two = run_tournament(1200, seed=4, workers=2)
+        self.assertEqual(one.games, 1200)
+        for name in ('timeouts', 'wins', 'turns', 'wars'):
+            self.assertEqual(getattr(one, name), getattr(two, name))
+
+    def test_merge(self):
+        report = WarReport().merge(run_tournament(300, seed=5, workers=1))
+        report.merge(run_tournament(300, seed=6, workers=1))
+        self.assertEqual(report.games, 600)
+        self.assertEqual(sum(report.turns.values()), 600)
+        self.assertEqual(sum(report.wins.values()) + report.timeouts, 600)
+        self.assertTrue(report.format())
+
+
+if __name__ == '__main__':
+    unittest.main()